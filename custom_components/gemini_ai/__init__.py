@@ -4,11 +4,12 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import aiohttp
+import orjson
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.helpers import discovery
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api_client import GeminiAPIClient
 from .const import (
@@ -18,6 +19,17 @@ from .const import (
     CONF_CONVERSATION_MODEL,
     CONF_DEFAULT_VOICE,
     CONF_SYSTEM_PROMPT,
+    CONF_MAX_CONCURRENT,
+    CONF_MAX_CONCURRENT_STT,
+    CONF_MAX_CONCURRENT_TTS,
+    CONNECTOR_KEEPALIVE_TIMEOUT,
+    CONNECTOR_LIMIT,
+    CONNECTOR_LIMIT_PER_HOST,
+    DATA_SESSION,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MAX_CONCURRENT_STT,
+    DEFAULT_MAX_CONCURRENT_TTS,
+    DNS_CACHE_TTL,
     DOMAIN,
     PLATFORMS,
 )
@@ -34,6 +46,14 @@ PLATFORMS_MAP = {
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     """Set up the Gemini AI integration."""
     hass.data.setdefault(DOMAIN, {})
+    
+    async def _async_close_session(event: Event) -> None:
+        """Close the pooled HTTP session when Home Assistant stops."""
+        session = hass.data[DOMAIN].pop(DATA_SESSION, None)
+        if session is not None:
+            await session.close()
+    
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_session)
     return True
 
 
@@ -44,19 +64,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Get configuration
     api_key = entry.data[CONF_API_KEY]
     
+    def _limit(key: str, default: int) -> int:
+        return entry.options.get(key, entry.data.get(key, default))
+    
     # Create API client
-    session = async_get_clientsession(hass)
+    session = _async_get_session(hass)
     api_client = GeminiAPIClient(
         api_key=api_key,
         session=session,
-        hass=hass
+        hass=hass,
+        max_concurrent=_limit(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT),
+        max_concurrent_stt=_limit(CONF_MAX_CONCURRENT_STT, DEFAULT_MAX_CONCURRENT_STT),
+        max_concurrent_tts=_limit(CONF_MAX_CONCURRENT_TTS, DEFAULT_MAX_CONCURRENT_TTS),
+        storage_key=f"gemini_ai_cache_{entry.entry_id}",
     )
     
-    # Test API connection
+    # Test API connection unless a call recently succeeded with this key
     try:
-        await api_client.test_connection()
+        if not await api_client.async_recently_validated():
+            await api_client.test_connection()
     except Exception as err:
         _LOGGER.error("Failed to connect to Gemini API: %s", err)
+        await api_client.close()
+        await _async_release_session(hass)
         return False
     
     # Store API client in hass data
@@ -94,10 +124,38 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         data = hass.data[DOMAIN].pop(entry.entry_id)
         api_client = data["api_client"]
         await api_client.close()
+        await _async_release_session(hass)
     
     return unload_ok
 
 
+def _async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the pooled HTTP session shared by all config entries."""
+    session = hass.data[DOMAIN].get(DATA_SESSION)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTOR_LIMIT,
+            limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+            keepalive_timeout=CONNECTOR_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            enable_cleanup_closed=True,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
+        )
+        hass.data[DOMAIN][DATA_SESSION] = session
+    return session
+
+
+async def _async_release_session(hass: HomeAssistant) -> None:
+    """Close the pooled session once no config entry is using it."""
+    if not any(key != DATA_SESSION for key in hass.data[DOMAIN]):
+        session = hass.data[DOMAIN].pop(DATA_SESSION, None)
+        if session is not None:
+            await session.close()
+
+
 async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle config entry updates."""
     _LOGGER.debug("Updating Gemini AI configuration")
@@ -0,0 +1,37 @@
+"""WAV helpers shared by the Gemini AI platforms."""
+from __future__ import annotations
+
+import struct
+
+# RIFF/WAVE header for PCM audio, compiled once for every WAV built here
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+
+def wav_header(
+    size: int,
+    sample_rate: int,
+    channels: int = 1,
+    bits_per_sample: int = 16,
+) -> bytes:
+    """Return a RIFF header for size bytes of PCM in the given format."""
+    block_align = channels * bits_per_sample // 8
+    return _WAV_HEADER.pack(
+        b'RIFF',
+        36 + size,
+        b'WAVE',
+        b'fmt ',
+        16,  # PCM
+        1,   # PCM
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits_per_sample,
+        b'data',
+        size
+    )
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap 16-bit mono PCM samples in a WAV header."""
+    return wav_header(len(pcm), sample_rate) + pcm
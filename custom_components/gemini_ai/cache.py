@@ -0,0 +1,139 @@
+"""Caching helpers shared by the Gemini AI platforms."""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import time
+from typing import Any, Dict
+
+import orjson
+
+from .const import CACHE_TTL, MAX_CACHE_SIZE, CACHE_MAX_MEMORY_MB
+
+
+def request_key(endpoint: str, model: str, params: Dict[str, Any]) -> str:
+    """Return a stable key identifying an upstream request."""
+    key_data = orjson.dumps([endpoint, model, params], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(key_data, digest_size=16).hexdigest()
+
+
+def _entry_size(value: Any) -> int:
+    """Return the approximate size of value in bytes.
+
+    Containers are measured by their serialized size, as sys.getsizeof only
+    counts the outer object.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return len(orjson.dumps(value))
+
+
+class LRUTTLCache:
+    """Bounded LRU cache with per-entry expiry.
+
+    Entries are evicted oldest-first once either the entry count or the
+    approximate memory footprint exceeds its limit. Timestamps are wall-clock
+    so that entries can be persisted and restored across restarts.
+    """
+
+    def __init__(
+        self,
+        max_size: int = MAX_CACHE_SIZE,
+        ttl: float = CACHE_TTL,
+        max_memory_mb: float = CACHE_MAX_MEMORY_MB,
+    ) -> None:
+        """Initialize the cache."""
+        self._max_size = max_size
+        self._ttl = ttl
+        self._max_memory = max_memory_mb * 1024 * 1024
+        self._memory = 0
+        self._data: OrderedDict[str, tuple[float, Any, int, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if a non-expired entry exists for key."""
+        return self.get(key) is not None
+
+    @property
+    def fill_ratio(self) -> float:
+        """Return how close the cache is to either of its limits."""
+        return max(len(self._data) / self._max_size, self._memory / self._max_memory)
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None or time.time() - entry[0] >= entry[3]:
+            return None
+
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def peek(self, key: str) -> Any:
+        """Return the cached value for key even if it has expired."""
+        entry = self._data.get(key)
+        return None if entry is None else entry[1]
+
+    def ttl(self, key: str) -> float:
+        """Return the expiry applied to key."""
+        entry = self._data.get(key)
+        return self._ttl if entry is None else entry[3]
+
+    def touch(self, key: str, ttl: float | None = None) -> None:
+        """Mark an existing entry as freshly validated."""
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data[key] = (time.time(), entry[1], entry[2], entry[3] if ttl is None else ttl)
+            self._data.move_to_end(key)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timestamp: float | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Store value under key, evicting the least recently used entries."""
+        self.pop(key)
+
+        size = _entry_size(value)
+        self._data[key] = (
+            time.time() if timestamp is None else timestamp,
+            value,
+            size,
+            self._ttl if ttl is None else ttl,
+        )
+        self._memory += size
+
+        while self._data and (
+            len(self._data) > self._max_size or self._memory > self._max_memory
+        ):
+            _, (_, _, evicted_size, _) = self._data.popitem(last=False)
+            self._memory -= evicted_size
+
+    def pop(self, key: str) -> Any:
+        """Remove key from the cache and return its value, if any."""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self._memory -= entry[2]
+        return entry[1]
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Populate the cache from its serialized form."""
+        now = time.time()
+        for key, (timestamp, value, *rest) in data.items():
+            ttl = rest[0] if rest else self._ttl
+            if now - timestamp < ttl:
+                self.set(key, value, timestamp, ttl)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return non-expired entries in a JSON serializable form."""
+        now = time.time()
+        return {
+            key: [timestamp, value, ttl]
+            for key, (timestamp, value, _, ttl) in self._data.items()
+            if now - timestamp < ttl
+        }
@@ -1,8 +1,12 @@
 """Config flow for Gemini AI integration."""
 from __future__ import annotations
 
+import asyncio
+from collections import ChainMap
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Optional, Sequence
 
 import voluptuous as vol
 from homeassistant import config_entries
@@ -13,6 +17,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api_client import GeminiAPIClient, GeminiAPIError
+from .cache import LRUTTLCache
 from .const import (
     CONF_API_KEY,
     CONF_TTS_MODEL,
@@ -23,6 +28,9 @@ from .const import (
     CONF_VOICE_PITCH,
     CONF_SYSTEM_PROMPT,
     CONF_LANGUAGE,
+    CONF_MAX_CONCURRENT,
+    CONF_MAX_CONCURRENT_STT,
+    CONF_MAX_CONCURRENT_TTS,
     DEFAULT_TTS_MODEL,
     DEFAULT_STT_MODEL,
     DEFAULT_CONVERSATION_MODEL,
@@ -31,15 +39,24 @@ from .const import (
     DEFAULT_VOICE_PITCH,
     DEFAULT_SYSTEM_PROMPT,
     DEFAULT_LANGUAGE,
-    AVAILABLE_VOICES,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MAX_CONCURRENT_STT,
+    DEFAULT_MAX_CONCURRENT_TTS,
+    AVAILABLE_MODELS,
+    AVAILABLE_VOICES_SORTED,
+    CONNECTOR_LIMIT_PER_HOST,
     DOMAIN,
-    ERROR_INVALID_API_KEY,
-    ERROR_QUOTA_EXCEEDED,
-    ERROR_NETWORK_ERROR,
+    VALIDATION_CACHE_TTL,
+    VALIDATION_CACHE_SIZE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Successful validations keyed by a hash of the API key, never the key itself
+_VALIDATION_CACHE = LRUTTLCache(
+    max_size=VALIDATION_CACHE_SIZE, ttl=VALIDATION_CACHE_TTL
+)
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_API_KEY): str,
@@ -47,45 +64,206 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+# Validators shared by the config and options flow schemas
+_VOICE_SPEED_VALIDATOR = vol.All(vol.Coerce(float), vol.Range(min=0.25, max=4.0))
+_VOICE_PITCH_VALIDATOR = vol.All(vol.Coerce(float), vol.Range(min=-20.0, max=20.0))
+_CONCURRENCY_VALIDATOR = vol.All(
+    vol.Coerce(int), vol.Range(min=1, max=CONNECTOR_LIMIT_PER_HOST)
+)
+
+def _options(values: tuple[str, ...]) -> dict[str, str]:
+    """Map each choice to its label for vol.In."""
+    return {value: value for value in values}
+
+
+# Used for any model category the API returned no models for
+_DEFAULT_MODELS: Dict[str, tuple[str, ...]] = {
+    "tts": (DEFAULT_TTS_MODEL,),
+    "stt": (DEFAULT_STT_MODEL,),
+    "conversation": (DEFAULT_CONVERSATION_MODEL,),
+}
+
+
+def _normalize_models(available_models: Dict[str, Any]) -> Dict[str, tuple[str, ...]]:
+    """Return the model lists as tuples with empty categories defaulted."""
+    return {
+        category: tuple(available_models.get(category) or default)
+        for category, default in _DEFAULT_MODELS.items()
+    }
+
+
+def _build_models_schema(
+    available_models: Dict[str, tuple[str, ...]],
+    defaults: tuple[str, str, str] | None = None,
+) -> vol.Schema:
+    """Return the model selection schema, defaulting to the first of each list."""
+    return _models_schema(
+        available_models["tts"],
+        available_models["stt"],
+        available_models["conversation"],
+        defaults,
+    )
+
+
+@lru_cache(maxsize=16)
+def _models_schema(
+    tts_models: tuple[str, ...],
+    stt_models: tuple[str, ...],
+    conversation_models: tuple[str, ...],
+    defaults: tuple[str, str, str] | None,
+) -> vol.Schema:
+    """Build the model selection schema once per set of choices."""
+    tts_default, stt_default, conversation_default = defaults or (
+        tts_models[0],
+        stt_models[0],
+        conversation_models[0],
+    )
+    return vol.Schema(
+        {
+            vol.Required(CONF_TTS_MODEL, default=tts_default): vol.In(_options(tts_models)),
+            vol.Required(CONF_STT_MODEL, default=stt_default): vol.In(_options(stt_models)),
+            vol.Required(CONF_CONVERSATION_MODEL, default=conversation_default): vol.In(
+                _options(conversation_models)
+            ),
+        }
+    )
+
+
+def _build_voice_schema(
+    voices: Sequence[str], defaults: tuple[str, float, float]
+) -> vol.Schema:
+    """Return the voice selection schema."""
+    return _voice_schema(tuple(voices), defaults)
+
+
+@lru_cache(maxsize=16)
+def _voice_schema(voices: tuple[str, ...], defaults: tuple[str, float, float]) -> vol.Schema:
+    """Build the voice selection schema once per set of choices."""
+    voice, speed, pitch = defaults
+    return vol.Schema(
+        {
+            vol.Required(CONF_DEFAULT_VOICE, default=voice): vol.In(_options(voices)),
+            vol.Optional(CONF_VOICE_SPEED, default=speed): _VOICE_SPEED_VALIDATOR,
+            vol.Optional(CONF_VOICE_PITCH, default=pitch): _VOICE_PITCH_VALIDATOR,
+        }
+    )
+
+
+@lru_cache(maxsize=16)
+def _voice_settings_schema(
+    voices: tuple[str, ...],
+    voice_defaults: tuple[str, float, float],
+    defaults: tuple[str, str, int, int, int],
+) -> vol.Schema:
+    """Build the options flow voice settings schema once per set of defaults."""
+    system_prompt, language, max_concurrent, max_concurrent_stt, max_concurrent_tts = defaults
+    return _voice_schema(voices, voice_defaults).extend(
+        {
+            vol.Optional(CONF_SYSTEM_PROMPT, default=system_prompt): str,
+            vol.Optional(CONF_LANGUAGE, default=language): str,
+            vol.Optional(CONF_MAX_CONCURRENT, default=max_concurrent): _CONCURRENCY_VALIDATOR,
+            vol.Optional(CONF_MAX_CONCURRENT_STT, default=max_concurrent_stt): _CONCURRENCY_VALIDATOR,
+            vol.Optional(CONF_MAX_CONCURRENT_TTS, default=max_concurrent_tts): _CONCURRENCY_VALIDATOR,
+        }
+    )
+
+
+# Static model choices for when the API listing is unavailable
+_FALLBACK_MODELS = _normalize_models(AVAILABLE_MODELS)
+
+_ADVANCED_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_SYSTEM_PROMPT, default=DEFAULT_SYSTEM_PROMPT): str,
+        vol.Optional(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): str,
+        vol.Optional(CONF_MAX_CONCURRENT, default=DEFAULT_MAX_CONCURRENT): _CONCURRENCY_VALIDATOR,
+        vol.Optional(CONF_MAX_CONCURRENT_STT, default=DEFAULT_MAX_CONCURRENT_STT): _CONCURRENCY_VALIDATOR,
+        vol.Optional(CONF_MAX_CONCURRENT_TTS, default=DEFAULT_MAX_CONCURRENT_TTS): _CONCURRENCY_VALIDATOR,
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
-    session = async_get_clientsession(hass)
+    title = data.get(CONF_NAME, "Gemini AI")
+    key_hash = hashlib.sha256(data[CONF_API_KEY].encode()).hexdigest()
+    
+    # Skip the network round-trips for a recently validated key
+    cached = _VALIDATION_CACHE.get(key_hash)
+    if cached is not None:
+        return {"title": title, **cached}
+    
     api_client = GeminiAPIClient(
         api_key=data[CONF_API_KEY],
-        session=session,
+        session=async_get_clientsession(hass),
         hass=hass,
     )
     
     try:
-        # Test connection
-        await api_client.test_connection()
-        
-        # Get available models
-        available_models = await api_client.get_available_models()
+        # The calls are independent, so run them concurrently; voices are
+        # only fetched once the voice step is reached
+        results = await asyncio.gather(
+            api_client.test_connection(),
+            api_client.get_available_models(),
+            return_exceptions=True,
+        )
         
-        # Get available voices
-        available_voices = await api_client.get_available_voices()
+        # Connection errors take precedence over the listing calls
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        _, available_models = results
+        available_models = _normalize_models(available_models)
         
-        return {
-            "title": data.get(CONF_NAME, "Gemini AI"),
-            "available_models": available_models,
-            "available_voices": available_voices,
-        }
+        # Only successful validations are cached
+        result = {"available_models": available_models}
+        _VALIDATION_CACHE.set(key_hash, result)
+        return {"title": title, **result}
     except GeminiAPIError as err:
-        if ERROR_INVALID_API_KEY in str(err):
-            raise InvalidAuth from err
-        elif ERROR_QUOTA_EXCEEDED in str(err):
-            raise QuotaExceeded from err
-        elif ERROR_NETWORK_ERROR in str(err):
-            raise CannotConnect from err
-        else:
-            raise CannotConnect from err
+        raise _ERROR_MAP.get(err.code, CannotConnect) from err
     finally:
         await api_client.close()
 
 
-class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+async def async_get_voices(
+    hass: HomeAssistant,
+    api_key: str,
+    api_client: GeminiAPIClient | None = None,
+) -> list[str]:
+    """Fetch the voices offered for the API key."""
+    owns_client = api_client is None
+    if owns_client:
+        api_client = GeminiAPIClient(
+            api_key=api_key,
+            session=async_get_clientsession(hass),
+            hass=hass,
+        )
+    
+    try:
+        return await api_client.get_available_voices()
+    except GeminiAPIError as err:
+        _LOGGER.warning("Failed to get available voices: %s", err)
+        return []
+    finally:
+        if owns_client:
+            await api_client.close()
+
+
+class _FlowStepsMixin:
+    """Step bookkeeping shared by the config and options flows."""
+
+    _data: MutableMapping[str, Any]
+
+    async def _advance(
+        self,
+        user_input: dict[str, Any],
+        next_step: Callable[[], Awaitable[FlowResult]],
+    ) -> FlowResult:
+        """Store a step's input and continue to the next step."""
+        self._data.update(user_input)
+        return await next_step()
+
+
+class ConfigFlow(_FlowStepsMixin, config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Gemini AI."""
 
     VERSION = 1
@@ -93,7 +271,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialize config flow."""
         self._data: Dict[str, Any] = {}
-        self._available_models: Dict[str, Any] = {}
+        self._available_models: Dict[str, Any] = _FALLBACK_MODELS
         self._available_voices: list[str] = []
 
     async def async_step_user(
@@ -106,13 +284,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             try:
                 info = await validate_input(self.hass, user_input)
                 
-                # Store validated data
-                self._data.update(user_input)
+                # Store validated data and move to model selection step
                 self._available_models = info["available_models"]
-                self._available_voices = info["available_voices"]
-                
-                # Move to model selection step
-                return await self.async_step_models()
+                return await self._advance(user_input, self.async_step_models)
                 
             except CannotConnect:
                 errors["base"] = "cannot_connect"
@@ -139,32 +313,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle model selection step."""
         errors: dict[str, str] = {}
         
-        # Create schema with available models
-        tts_models = self._available_models.get("tts", [DEFAULT_TTS_MODEL])
-        stt_models = self._available_models.get("stt", [DEFAULT_STT_MODEL])
-        conversation_models = self._available_models.get("conversation", [DEFAULT_CONVERSATION_MODEL])
-        
-        if not tts_models:
-            tts_models = [DEFAULT_TTS_MODEL]
-        if not stt_models:
-            stt_models = [DEFAULT_STT_MODEL]
-        if not conversation_models:
-            conversation_models = [DEFAULT_CONVERSATION_MODEL]
-        
-        models_schema = vol.Schema(
-            {
-                vol.Required(CONF_TTS_MODEL, default=tts_models[0]): vol.In(tts_models),
-                vol.Required(CONF_STT_MODEL, default=stt_models[0]): vol.In(stt_models),
-                vol.Required(CONF_CONVERSATION_MODEL, default=conversation_models[0]): vol.In(conversation_models),
-            }
-        )
+        models_schema = _build_models_schema(self._available_models)
         
         if user_input is not None:
-            # Store model selections
-            self._data.update(user_input)
-            
-            # Move to voice configuration step
-            return await self.async_step_voice()
+            # Store model selections and move to voice configuration step
+            return await self._advance(user_input, self.async_step_voice)
 
         return self.async_show_form(
             step_id="models",
@@ -178,27 +331,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle voice configuration step."""
         errors: dict[str, str] = {}
         
+        # Load voices on first display of this step
+        if user_input is None and not self._available_voices:
+            self._available_voices = await async_get_voices(
+                self.hass, self._data[CONF_API_KEY]
+            )
+        
         # Use available voices or fallback to defaults
-        voices = self._available_voices if self._available_voices else AVAILABLE_VOICES
+        voices = self._available_voices if self._available_voices else AVAILABLE_VOICES_SORTED
         
-        voice_schema = vol.Schema(
-            {
-                vol.Required(CONF_DEFAULT_VOICE, default=DEFAULT_VOICE): vol.In(voices),
-                vol.Optional(CONF_VOICE_SPEED, default=DEFAULT_VOICE_SPEED): vol.All(
-                    vol.Coerce(float), vol.Range(min=0.25, max=4.0)
-                ),
-                vol.Optional(CONF_VOICE_PITCH, default=DEFAULT_VOICE_PITCH): vol.All(
-                    vol.Coerce(float), vol.Range(min=-20.0, max=20.0)
-                ),
-            }
+        voice_schema = _build_voice_schema(
+            voices, (DEFAULT_VOICE, DEFAULT_VOICE_SPEED, DEFAULT_VOICE_PITCH)
         )
         
         if user_input is not None:
-            # Store voice settings
-            self._data.update(user_input)
-            
-            # Move to advanced settings step
-            return await self.async_step_advanced()
+            # Store voice settings and move to advanced settings step
+            return await self._advance(user_input, self.async_step_advanced)
 
         return self.async_show_form(
             step_id="voice",
@@ -212,13 +360,6 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle advanced settings step."""
         errors: dict[str, str] = {}
         
-        advanced_schema = vol.Schema(
-            {
-                vol.Optional(CONF_SYSTEM_PROMPT, default=DEFAULT_SYSTEM_PROMPT): str,
-                vol.Optional(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): str,
-            }
-        )
-        
         if user_input is not None:
             # Store advanced settings
             self._data.update(user_input)
@@ -231,7 +372,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="advanced",
-            data_schema=advanced_schema,
+            data_schema=_ADVANCED_SCHEMA,
             errors=errors,
         )
 
@@ -244,16 +385,28 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return OptionsFlowHandler(config_entry)
 
 
-class OptionsFlowHandler(config_entries.OptionsFlow):
+class OptionsFlowHandler(_FlowStepsMixin, config_entries.OptionsFlow):
     """Handle options flow for Gemini AI."""
 
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
-        self._data: Dict[str, Any] = dict(config_entry.data)
-        self._available_models: Dict[str, Any] = {}
+        # Edits land in the top map; reads fall through to the entry data
+        self._data: ChainMap[str, Any] = ChainMap({}, config_entry.data)
+        self._available_models: Dict[str, Any] = _FALLBACK_MODELS
         self._available_voices: list[str] = []
 
+    def _saved_option(self, key: str, default: Any) -> Any:
+        """Return a setting as the integration reads it, options before data."""
+        return self.config_entry.options.get(key, self.config_entry.data.get(key, default))
+
+    def _entry_client(self) -> GeminiAPIClient | None:
+        """Return the loaded entry's client while its API key is still in use."""
+        if self._data.get(CONF_API_KEY) != self.config_entry.data.get(CONF_API_KEY):
+            return None
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        return entry_data["api_client"] if entry_data else None
+
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -280,7 +433,6 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 try:
                     info = await validate_input(self.hass, user_input)
                     self._available_models = info["available_models"]
-                    self._available_voices = info["available_voices"]
                 except CannotConnect:
                     errors["base"] = "cannot_connect"
                 except InvalidAuth:
@@ -300,6 +452,13 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             
             # Store API key
             self._data.update(user_input)
+            
+            # An unchanged key can reuse the running client and its cache
+            if (api_client := self._entry_client()) is not None:
+                self._available_models = _normalize_models(
+                    await api_client.get_available_models()
+                )
+            
             return await self.async_step_model_settings()
 
         return self.async_show_form(
@@ -319,28 +478,13 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         current_stt = self.config_entry.data.get(CONF_STT_MODEL, DEFAULT_STT_MODEL)
         current_conversation = self.config_entry.data.get(CONF_CONVERSATION_MODEL, DEFAULT_CONVERSATION_MODEL)
         
-        # Use available models if we have them, otherwise use defaults
-        if self._available_models:
-            tts_models = self._available_models.get("tts", [DEFAULT_TTS_MODEL])
-            stt_models = self._available_models.get("stt", [DEFAULT_STT_MODEL])
-            conversation_models = self._available_models.get("conversation", [DEFAULT_CONVERSATION_MODEL])
-        else:
-            tts_models = [DEFAULT_TTS_MODEL]
-            stt_models = [DEFAULT_STT_MODEL]
-            conversation_models = [DEFAULT_CONVERSATION_MODEL]
-        
-        models_schema = vol.Schema(
-            {
-                vol.Required(CONF_TTS_MODEL, default=current_tts): vol.In(tts_models),
-                vol.Required(CONF_STT_MODEL, default=current_stt): vol.In(stt_models),
-                vol.Required(CONF_CONVERSATION_MODEL, default=current_conversation): vol.In(conversation_models),
-            }
+        models_schema = _build_models_schema(
+            self._available_models, (current_tts, current_stt, current_conversation)
         )
         
         if user_input is not None:
             # Store model settings
-            self._data.update(user_input)
-            return await self.async_step_voice_settings()
+            return await self._advance(user_input, self.async_step_voice_settings)
 
         return self.async_show_form(
             step_id="model_settings",
@@ -360,30 +504,42 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         current_pitch = self.config_entry.data.get(CONF_VOICE_PITCH, DEFAULT_VOICE_PITCH)
         current_system_prompt = self.config_entry.data.get(CONF_SYSTEM_PROMPT, DEFAULT_SYSTEM_PROMPT)
         current_language = self.config_entry.data.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
+        current_max_concurrent = self._saved_option(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT)
+        current_max_concurrent_stt = self._saved_option(CONF_MAX_CONCURRENT_STT, DEFAULT_MAX_CONCURRENT_STT)
+        current_max_concurrent_tts = self._saved_option(CONF_MAX_CONCURRENT_TTS, DEFAULT_MAX_CONCURRENT_TTS)
+        
+        # Load voices on first display of this step
+        if user_input is None and not self._available_voices:
+            self._available_voices = await async_get_voices(
+                self.hass, self._data[CONF_API_KEY], self._entry_client()
+            )
         
         # Use available voices if we have them, otherwise use defaults
-        voices = self._available_voices if self._available_voices else AVAILABLE_VOICES
+        voices = self._available_voices if self._available_voices else AVAILABLE_VOICES_SORTED
         
-        voice_schema = vol.Schema(
-            {
-                vol.Required(CONF_DEFAULT_VOICE, default=current_voice): vol.In(voices),
-                vol.Optional(CONF_VOICE_SPEED, default=current_speed): vol.All(
-                    vol.Coerce(float), vol.Range(min=0.25, max=4.0)
-                ),
-                vol.Optional(CONF_VOICE_PITCH, default=current_pitch): vol.All(
-                    vol.Coerce(float), vol.Range(min=-20.0, max=20.0)
-                ),
-                vol.Optional(CONF_SYSTEM_PROMPT, default=current_system_prompt): str,
-                vol.Optional(CONF_LANGUAGE, default=current_language): str,
-            }
+        voice_schema = _voice_settings_schema(
+            tuple(voices),
+            (current_voice, current_speed, current_pitch),
+            (
+                current_system_prompt,
+                current_language,
+                current_max_concurrent,
+                current_max_concurrent_stt,
+                current_max_concurrent_tts,
+            ),
         )
         
         if user_input is not None:
             # Store voice settings
             self._data.update(user_input)
             
+            # Skip the entry reload when nothing differs from the current settings
+            current = {**self.config_entry.data, **self.config_entry.options}
+            if all(current.get(key) == value for key, value in self._data.maps[0].items()):
+                return self.async_abort(reason="no_changes")
+            
             # Update the config entry
-            return self.async_create_entry(title="", data=self._data)
+            return self.async_create_entry(title="", data=dict(self._data))
 
         return self.async_show_form(
             step_id="voice_settings",
@@ -401,4 +557,11 @@ class InvalidAuth(HomeAssistantError):
 
 
 class QuotaExceeded(HomeAssistantError):
-    """Error to indicate quota is exceeded.""" 
\ No newline at end of file
+    """Error to indicate quota is exceeded."""
+
+
+# Flow errors raised for the HTTP status of a failed validation
+_ERROR_MAP: dict[int, type[HomeAssistantError]] = {
+    401: InvalidAuth,
+    429: QuotaExceeded,
+} 
\ No newline at end of file
@@ -1,6 +1,7 @@
 """Constants for the Gemini AI integration."""
 from __future__ import annotations
 
+import sys
 from typing import Final
 
 # Integration domain
@@ -16,31 +17,53 @@ CONF_VOICE_SPEED: Final = "voice_speed"
 CONF_VOICE_PITCH: Final = "voice_pitch"
 CONF_SYSTEM_PROMPT: Final = "system_prompt"
 CONF_LANGUAGE: Final = "language"
+CONF_MAX_CONCURRENT: Final = "max_concurrent"
+CONF_MAX_CONCURRENT_STT: Final = "max_concurrent_stt"
+CONF_MAX_CONCURRENT_TTS: Final = "max_concurrent_tts"
 
 # API Configuration
 API_BASE_URL: Final = "https://generativelanguage.googleapis.com/v1beta/"
+UPLOAD_API_URL: Final = "https://generativelanguage.googleapis.com/upload/v1beta/files"
 LIVE_API_URL: Final = "wss://generativelanguage.googleapis.com/ws/google.ai.generativelanguage.v1beta.GenerativeService.BidiGenerateContent"
 
+LIVE_API_SAMPLE_RATE: Final = 24000  # Live API returns 16-bit mono PCM at 24kHz
+LIVE_SESSION_MAX_TURNS: Final = 10  # Phrases spoken on one Live API session before it is replaced
+LIVE_SESSION_IDLE_TIMEOUT: Final = 60  # seconds an idle Live API session is still reused
+
 # Default models
 DEFAULT_TTS_MODEL: Final = "gemini-2.0-flash-exp"
 DEFAULT_STT_MODEL: Final = "gemini-2.0-flash"
 DEFAULT_CONVERSATION_MODEL: Final = "gemini-2.0-flash"
+EMBEDDING_MODEL: Final = "text-embedding-004"
 
 # Available models
 AVAILABLE_MODELS: Final = {
-    "tts": ["gemini-2.0-flash-exp"],
-    "stt": ["gemini-2.0-flash", "gemini-1.5-flash"],
-    "conversation": ["gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"]
+    "tts": ("gemini-2.0-flash-exp",),
+    "stt": ("gemini-2.0-flash", "gemini-1.5-flash"),
+    "conversation": ("gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro")
 }
 
 # Voice options
-AVAILABLE_VOICES: Final = [
+AVAILABLE_VOICES: Final = frozenset({
     "Aoede",
-    "Charon", 
+    "Charon",
     "Fenrir",
     "Kore",
     "Puck"
-]
+})
+AVAILABLE_VOICES_SORTED: Final = tuple(sorted(AVAILABLE_VOICES))  # Display order
+
+# Languages offered by the STT and TTS entities
+SUPPORTED_LANGUAGES: Final = (
+    "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh",
+    "ar", "hi", "th", "vi", "tr", "pl", "nl", "sv", "da", "no",
+    "fi", "cs", "hu", "ro", "bg", "hr", "sk", "sl", "et", "lv",
+    "lt", "mt", "ga", "is", "mk", "sq", "sr", "bs", "me", "uk",
+    "be", "kk", "ky", "uz", "tg", "mn", "ka", "hy", "az", "eu",
+    "ca", "gl", "cy", "br", "co", "eo", "ia", "ie", "ig", "mg",
+    "mi", "ms", "sw", "zu", "xh", "af", "am", "bn", "gu", "he",
+    "kn", "ml", "mr", "ne", "or", "pa", "si", "ta", "te", "ur",
+)
 
 # Default configuration values
 DEFAULT_VOICE: Final = "Aoede"
@@ -50,9 +73,12 @@ DEFAULT_LANGUAGE: Final = "en"
 DEFAULT_SYSTEM_PROMPT: Final = "You are a helpful Home Assistant voice assistant."
 
 # Audio settings
-SUPPORTED_AUDIO_FORMATS: Final = ["mp3", "wav", "ogg", "flac", "m4a"]
+SUPPORTED_AUDIO_FORMATS: Final = frozenset({"mp3", "wav", "ogg", "flac", "m4a"})
 MAX_AUDIO_SIZE: Final = 10 * 1024 * 1024  # 10MB
 AUDIO_CHUNK_SIZE: Final = 1024 * 1024  # 1MB chunks
+SILENCE_RMS_THRESHOLD: Final = 500  # 16-bit sample RMS below which a frame is silent
+SPLIT_PAUSE_MS: Final = 300  # Silence long enough to split long audio at
+FILE_UPLOAD_THRESHOLD: Final = 256 * 1024  # Upload larger clips via the File API
 
 # Service names
 SERVICE_SAY: Final = "say"
@@ -60,21 +86,71 @@ SERVICE_TRANSCRIBE: Final = "transcribe"
 SERVICE_PROCESS: Final = "process"
 SERVICE_PREVIEW_VOICE: Final = "preview_voice"
 
-# Event names
-EVENT_TTS_COMPLETE: Final = f"{DOMAIN}_tts_complete"
-EVENT_STT_COMPLETE: Final = f"{DOMAIN}_stt_complete"
-EVENT_CONVERSATION_RESPONSE: Final = f"{DOMAIN}_conversation_response"
-EVENT_ERROR: Final = f"{DOMAIN}_error"
+# Event names (interned, as f-strings are not interned like plain literals)
+EVENT_TTS_COMPLETE: Final = sys.intern(f"{DOMAIN}_tts_complete")
+EVENT_STT_COMPLETE: Final = sys.intern(f"{DOMAIN}_stt_complete")
+EVENT_CONVERSATION_RESPONSE: Final = sys.intern(f"{DOMAIN}_conversation_response")
+EVENT_ERROR: Final = sys.intern(f"{DOMAIN}_error")
 
 # Cache settings
 CACHE_TTL: Final = 3600  # 1 hour
 MAX_CACHE_SIZE: Final = 100  # Maximum cached items
+TTS_CACHE_SAVE_DELAY: Final = 10  # seconds to coalesce TTS cache index writes
+TTS_CACHE_SWEEP_INSERTS: Final = 16  # New entries between scans for expired TTS audio
+TTS_CACHE_MAX_HITS: Final = 1024  # Hit count at which all TTS hit counts are halved
+TTS_MEMORY_CACHE_SIZE: Final = 16  # Recently played TTS clips also kept in memory
+TTS_MEMORY_CACHE_MB: Final = 16  # Approximate memory ceiling for those clips
+CACHE_MAX_MEMORY_MB: Final = 8  # Approximate memory ceiling for the API cache
+MODELS_CACHE_MIN_TTL: Final = 300  # 5 minutes
+MODELS_CACHE_MAX_TTL: Final = 86400  # 24 hours
+MODELS_CACHE_GROW_AFTER: Final = 3  # Unchanged refreshes in a row before the model list TTL doubles
+MODELS_REFRESH_AHEAD: Final = 0.8  # Refresh the model list at 80% of its TTL
+CONNECTION_PROBE_TTL: Final = 600  # Skip the startup probe within 10 minutes
+VALIDATION_CACHE_TTL: Final = 12 * 3600  # Reuse a successful key validation for 12 hours
+VALIDATION_CACHE_SIZE: Final = 32
+MISSING_MODEL_TTL: Final = 300  # Remember models that returned 404 for 5 minutes
+CACHE_SAVE_DELAY: Final = 30  # seconds to coalesce cache writes to storage
+CACHE_SAVE_TIMEOUT: Final = 2  # seconds allowed for the final save on unload
+RESPONSE_CACHE_SIZE: Final = 256  # Conversation replies kept per entity
+RESPONSE_CACHE_TTL: Final = 600  # 10 minutes
+RESPONSE_CACHE_HISTORY: Final = 4  # Recent messages that are part of the reply key
+SEMANTIC_CACHE_SIZE: Final = 64  # Embedded opening-turn replies kept per entity
+SEMANTIC_CACHE_THRESHOLD: Final = 0.9  # Cosine similarity needed to reuse a reply
+SPEECH_CACHE_SIZE: Final = 64  # Audio clips kept for the say and preview services
+SPEECH_CACHE_TTL: Final = 86400  # 24 hours
+SPEECH_CACHE_MEMORY_MB: Final = 32  # Approximate memory ceiling for cached audio
+TRANSCRIPT_CACHE_SIZE: Final = 100  # Transcripts kept per STT entity, keyed by audio
+TRANSCRIPT_CACHE_TTL: Final = 86400  # 24 hours
+HISTORY_SAVE_DELAY: Final = 2  # seconds to coalesce conversation history writes
+HISTORY_MAX_MESSAGES: Final = 20  # Messages sent with each request; older ones are summarized
+HISTORY_KEEP_MESSAGES: Final = 10  # Messages left verbatim after summarizing
+HISTORY_MAX_CHARS: Final = 8000  # History text (~2k tokens) that also triggers a summary
+HISTORY_STORED_MESSAGES: Final = 40  # Hard cap on stored messages if summarizing fails
+HISTORY_IDLE_TTL: Final = 3600  # seconds before an idle conversation leaves memory
+HISTORY_SWEEP_INTERVAL: Final = 300  # seconds between idle conversation sweeps
 
 # Rate limiting
-MAX_CONCURRENT_REQUESTS: Final = 5
+DEFAULT_MAX_CONCURRENT: Final = 20  # Conversation and text generation
+DEFAULT_MAX_CONCURRENT_STT: Final = 3
+DEFAULT_MAX_CONCURRENT_TTS: Final = 5
+AUDIO_REQUESTS_PER_MINUTE: Final = 60  # Speech and transcription calls allowed per minute
+SLOT_WAIT_WARNING: Final = 0.05  # seconds spent waiting for a request slot
 REQUEST_TIMEOUT: Final = 30  # seconds
 RETRY_ATTEMPTS: Final = 3
 RETRY_DELAY: Final = 1  # seconds
+BATCH_WINDOW: Final = 0.02  # seconds to wait for more requests to batch
+BATCH_MAX_SIZE: Final = 8  # Maximum requests combined into one batch
+EMBED_BATCH_WINDOW: Final = 0.005  # seconds to wait for more texts to embed together
+TTS_BATCH_WINDOW: Final = 0.05  # seconds to wait for more phrases in the same voice
+
+# Connection pooling
+CONNECTOR_LIMIT: Final = 100
+CONNECTOR_LIMIT_PER_HOST: Final = 30
+CONNECTOR_KEEPALIVE_TIMEOUT: Final = 30  # seconds
+DNS_CACHE_TTL: Final = 300  # seconds
+
+# hass.data keys shared by all config entries
+DATA_SESSION: Final = "_session"
 
 # Platforms
 PLATFORMS: Final = ["tts", "stt", "conversation"]
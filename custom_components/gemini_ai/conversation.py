@@ -1,18 +1,31 @@
 """Conversation platform for Gemini AI integration."""
 from __future__ import annotations
 
+from array import array
+import asyncio
+from collections import deque
+import datetime
+import functools
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
+import math
+import operator
+import re
+import time
+import unicodedata
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 from homeassistant.components.conversation import ConversationEntity, ConversationInput, ConversationResult
 from homeassistant.components.conversation.const import ConversationEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers import intent
 
 from .api_client import GeminiAPIClient, GeminiAPIError
+from .cache import LRUTTLCache, request_key
 from .const import (
     CONF_CONVERSATION_MODEL,
     CONF_SYSTEM_PROMPT,
@@ -22,11 +35,174 @@ from .const import (
     DEFAULT_LANGUAGE,
     DOMAIN,
     EVENT_CONVERSATION_RESPONSE,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_HISTORY,
+    SEMANTIC_CACHE_SIZE,
+    SEMANTIC_CACHE_THRESHOLD,
+    HISTORY_SAVE_DELAY,
+    HISTORY_MAX_MESSAGES,
+    HISTORY_KEEP_MESSAGES,
+    HISTORY_STORED_MESSAGES,
+    HISTORY_MAX_CHARS,
+    HISTORY_IDLE_TTL,
+    HISTORY_SWEEP_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# Gemini supports many languages for conversation
+_SUPPORTED_LANGUAGES = (
+    "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh",
+    "ar", "hi", "th", "vi", "tr", "pl", "nl", "sv", "da", "no",
+    "fi", "cs", "hu", "ro", "bg", "hr", "sk", "sl", "et", "lv",
+    "lt", "mt", "ga", "is", "mk", "sq", "sr", "bs", "me", "uk",
+    "be", "kk", "ky", "uz", "tg", "mn", "ka", "hy", "az", "eu",
+    "ca", "gl", "cy", "br", "co", "eo", "ia", "ie", "ig", "mg",
+    "mi", "ms", "sw", "zu", "xh", "af", "am", "bn", "gu", "he",
+    "kn", "ml", "mr", "ne", "or", "pa", "si", "ta", "te", "ur",
+)
+
+# Intent keywords, checked in priority order
+_CONTROL_KEYWORDS = frozenset({"turn on", "turn off", "switch on", "switch off"})
+_WEATHER_KEYWORDS = frozenset({"weather", "temperature", "forecast"})
+_TIME_KEYWORDS = frozenset({"time", "date", "what day"})
+_INTENT_KEYWORDS = {
+    "control": _CONTROL_KEYWORDS,
+    "weather": _WEATHER_KEYWORDS,
+    "time": _TIME_KEYWORDS,
+}
+# Earlier kinds win when the text matches several
+_INTENT_RANK = {kind: rank for rank, kind in enumerate(_INTENT_KEYWORDS)}
+
+# All keywords matched in a single scan of the lower-cased text
+_INTENT_RE = re.compile(
+    "|".join(
+        f"(?P<{kind}>{'|'.join(map(re.escape, sorted(keywords, key=len, reverse=True)))})"
+        for kind, keywords in _INTENT_KEYWORDS.items()
+    )
+)
+
+# Time questions answered from the local clock without asking Gemini
+_PLAIN_TIME_QUERIES = frozenset({
+    "time",
+    "the time",
+    "what time",
+    "what time is it",
+    "what's the time",
+    "what is the time",
+    "date",
+    "what's the date",
+    "what is the date",
+    "what day is it",
+    "what's the date today",
+    "what day is it today",
+})
+
+
+def _detect_intent(lower_text: str) -> Optional[str]:
+    """Return the highest-ranked intent whose keywords occur in the text."""
+    best = None
+    for match in _INTENT_RE.finditer(lower_text):
+        kind = match.lastgroup
+        if best is None or _INTENT_RANK[kind] < _INTENT_RANK[best]:
+            best = kind
+            if _INTENT_RANK[kind] == 0:
+                # Nothing outranks the first kind, so stop scanning
+                break
+    return best
+
+
+# Instructions, prompt, reply when Gemini returns nothing, and reply on error
+# per intent. The instructions are static and join the system prompt so the
+# request prefix stays byte-identical for provider prompt caching; only the
+# prompt varies, filled with format_map from the user text and, for time,
+# the clock.
+_INTENT_TABLE = {
+    # Home Assistant control intents
+    "control": (
+        "You are a Home Assistant voice assistant. The user's message is a device control request. "
+        "Please respond with:\n"
+        "1. A confirmation of what action you would take\n"
+        "2. Note that you're a demo integration and cannot actually control devices yet\n\n"
+        "Be helpful and conversational.",
+        'The user said: "{user_text}"',
+        "I understand you want to control a device, but I'm still learning how to do that.",
+        "I understand you want to control something, but I'm having trouble processing that right now.",
+    ),
+    # Weather intents
+    "weather": (
+        "You are a Home Assistant voice assistant. The user's message is a weather request. "
+        "Please respond helpfully, noting that:\n"
+        "1. You don't have access to current weather data in this demo\n"
+        "2. In a full integration, you could access Home Assistant's weather entities\n"
+        "3. Be conversational and suggest how they could get weather information\n\n"
+        "Be helpful and friendly.",
+        'The user asked: "{user_text}"',
+        "I'd love to help with weather information, but I don't have access to weather data right now.",
+        "I'd like to help with weather information, but I'm having trouble accessing that right now.",
+    ),
+    # Time/date intents
+    "time": (
+        "You are a Home Assistant voice assistant. The user's message is a time/date request. "
+        "Please provide a natural, conversational response that includes the relevant "
+        "time/date information.",
+        'The user asked: "{user_text}"\n\nThe current time is: {time_info}',
+        "The current time is {time_info}.",
+        "The current time is {time_info}.",
+    ),
+}
+
+_SUMMARY_PROMPT = (
+    "Summarize the conversation below between a user and a Home Assistant "
+    "voice assistant in a few sentences. Keep any facts, names and preferences "
+    "the assistant should remember.\n\n{summary}{transcript}"
+)
+
+
+def _history_context(conversation: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Return the summary and recent messages sent along with a new prompt."""
+    recent = conversation["turns"][-HISTORY_MAX_MESSAGES:]
+    if not conversation["summary"]:
+        return recent
+    return [
+        {"role": "user", "content": f"Summary of our earlier conversation: {conversation['summary']}"},
+        *recent,
+    ]
+
+
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _time_info(now: datetime.datetime) -> str:
+    """Format a time like strftime("%I:%M %p on %A, %B %d, %Y") in English."""
+    hour = now.hour % 12 or 12
+    meridiem = "AM" if now.hour < 12 else "PM"
+    return (
+        f"{hour:02d}:{now.minute:02d} {meridiem} on {_WEEKDAYS[now.weekday()]}, "
+        f"{_MONTHS[now.month - 1]} {now.day:02d}, {now.year}"
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _canned_response(language: str, text: str) -> intent.IntentResponse:
+    """Return a shared response speaking a fixed reply in the given language."""
+    response = intent.IntentResponse(language=language)
+    response.async_set_speech(text)
+    return response
+
+
+def _unit_vector(values: List[float]) -> array:
+    """Return values scaled to unit length as a compact float array."""
+    norm = math.sqrt(sum(value * value for value in values)) or 1.0
+    return array("f", [value / norm for value in values])
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -67,11 +243,36 @@ class GeminiConversationEntity(ConversationEntity):
         self._model = config.get(CONF_CONVERSATION_MODEL, DEFAULT_CONVERSATION_MODEL)
         self._system_prompt = config.get(CONF_SYSTEM_PROMPT, DEFAULT_SYSTEM_PROMPT)
         self._language = config.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
+        self._intent_system_prompts = {
+            kind: f"{self._system_prompt}\n\n{instructions}"
+            for kind, (instructions, *_) in _INTENT_TABLE.items()
+        }
+        
+        # Conversation history storage: an index of conversation IDs plus one
+        # store per conversation, so a turn only rewrites its own history
+        self._index_store = Store(hass, 1, f"gemini_ai_conversations_{entry_id}_index")
+        self._stores: Dict[str, Store] = {}
+        # Each conversation holds a rolling summary and its recent turns.
+        # Only recently used ones stay in memory; the rest load on demand
+        self._conversation_ids: set[str] = set()
+        self._conversations: Dict[str, Dict[str, Any]] = {}
+        self._last_used: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._conversations_loaded = asyncio.Event()
+        # Conversations changed since their last write to disk
+        self._unsaved: set[str] = set()
+        self._summarizing: set[str] = set()
+        
+        # Recent replies for repeated questions; keys include the model and
+        # system prompt, so a reload with new settings starts fresh
+        self._response_cache = LRUTTLCache(
+            max_size=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL
+        )
         
-        # Conversation history storage
-        self._store = Store(hass, 1, f"gemini_ai_conversations_{entry_id}")
-        self._conversations: Dict[str, List[Dict[str, str]]] = {}
-        self._conversations_loaded = False
+        # Unit-length embeddings of opening prompts and their replies, to
+        # answer paraphrases of recent questions; only turns without history
+        # are kept, as a follow-up means something else in another context
+        self._semantic_cache: Deque[Tuple[array, str]] = deque(maxlen=SEMANTIC_CACHE_SIZE)
         
         # Load conversations on startup
         hass.async_create_task(self._load_conversations())
@@ -79,13 +280,82 @@ class GeminiConversationEntity(ConversationEntity):
     async def _load_conversations(self) -> None:
         """Load conversation history from storage."""
         try:
-            stored_conversations = await self._store.async_load()
-            if stored_conversations:
-                self._conversations = stored_conversations
-            self._conversations_loaded = True
+            index = await self._index_store.async_load()
+            if index is None:
+                await self._migrate_conversations()
+            else:
+                self._conversation_ids = set(index.get("conversations", []))
         except Exception as err:
             _LOGGER.warning("Failed to load conversation history: %s", err)
-            self._conversations_loaded = True
+        finally:
+            self._conversations_loaded.set()
+
+    async def _migrate_conversations(self) -> None:
+        """Split history from the former single store into per-conversation stores."""
+        legacy_store = Store(self._hass, 1, f"gemini_ai_conversations_{self._entry_id}")
+        stored_conversations = await legacy_store.async_load()
+        if not stored_conversations:
+            return
+        
+        # Histories saved as plain turn lists predate summaries
+        self._conversations = {
+            conversation_id: (
+                conversation
+                if isinstance(conversation, dict)
+                else {"summary": "", "turns": conversation}
+            )
+            for conversation_id, conversation in stored_conversations.items()
+        }
+        self._conversation_ids = set(self._conversations)
+        now = time.monotonic()
+        self._last_used = dict.fromkeys(self._conversations, now)
+        await self._save_conversations()
+        await legacy_store.async_remove()
+
+    def _conversation_store(self, conversation_id: str) -> Store:
+        """Return the store holding one conversation's history."""
+        store = self._stores.get(conversation_id)
+        if store is None:
+            # Conversation IDs are caller supplied, so hash them for the file name
+            digest = hashlib.blake2b(conversation_id.encode(), digest_size=8).hexdigest()
+            # No custom encoder, so Store keeps its orjson fast path; history
+            # must stay plain dicts, lists and strings for that to hold
+            store = self._stores[conversation_id] = Store(
+                self._hass, 1, f"gemini_ai_conversations_{self._entry_id}_{digest}"
+            )
+        return store
+
+    def _index_data(self) -> Dict[str, Any]:
+        """Return the serialized index of stored conversations."""
+        return {"conversations": list(self._conversation_ids)}
+
+    async def async_added_to_hass(self) -> None:
+        """Start sweeping idle conversations out of memory."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self._hass,
+                self._evict_idle_conversations,
+                datetime.timedelta(seconds=HISTORY_SWEEP_INTERVAL),
+            )
+        )
+
+    @callback
+    def _evict_idle_conversations(self, _now: datetime.datetime) -> None:
+        """Drop conversations that are idle and already saved from memory."""
+        cutoff = time.monotonic() - HISTORY_IDLE_TTL
+        idle = [
+            conversation_id
+            for conversation_id, last_used in self._last_used.items()
+            if last_used < cutoff
+            and conversation_id not in self._unsaved
+            and conversation_id not in self._summarizing
+        ]
+        for conversation_id in idle:
+            del self._conversations[conversation_id]
+            del self._last_used[conversation_id]
+            self._stores.pop(conversation_id, None)
+            self._drop_lock(conversation_id)
 
     @property
     def name(self) -> str:
@@ -98,281 +368,401 @@ class GeminiConversationEntity(ConversationEntity):
         return f"{DOMAIN}_{self._entry_id}_conversation"
 
     @property
-    def supported_languages(self) -> list[str]:
+    def supported_languages(self) -> tuple[str, ...]:
         """Return list of supported languages."""
-        # Gemini supports many languages for conversation
-        return [
-            "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh",
-            "ar", "hi", "th", "vi", "tr", "pl", "nl", "sv", "da", "no",
-            "fi", "cs", "hu", "ro", "bg", "hr", "sk", "sl", "et", "lv",
-            "lt", "mt", "ga", "is", "mk", "sq", "sr", "bs", "me", "uk",
-            "be", "kk", "ky", "uz", "tg", "mn", "ka", "hy", "az", "eu",
-            "ca", "gl", "cy", "br", "co", "eo", "ia", "ie", "ig", "mg",
-            "mi", "ms", "sw", "zu", "xh", "af", "am", "bn", "gu", "he",
-            "kn", "ml", "mr", "ne", "or", "pa", "si", "ta", "te", "ur"
-        ]
+        return _SUPPORTED_LANGUAGES
 
     async def async_process(self, user_input: ConversationInput) -> ConversationResult:
         """Process a conversation turn."""
         try:
             # Extract user text from input
-            user_text = user_input.text.strip()
+            # Most input arrives already trimmed, so only strip when needed
+            user_text = user_input.text
+            if user_text[:1].isspace() or user_text[-1:].isspace():
+                user_text = user_text.strip()
             if not user_text:
-                response = intent.IntentResponse(language=user_input.language)
-                response.async_set_speech("I'm sorry, I didn't hear anything.")
                 return ConversationResult(
-                    response=response,
+                    response=_canned_response(
+                        user_input.language, "I'm sorry, I didn't hear anything."
+                    ),
                     conversation_id=user_input.conversation_id,
                 )
 
-            # Load conversation history
+            # Turns in one conversation run in order, so each sees the last reply
             conversation_id = user_input.conversation_id or "default"
-            conversation_history = await self.async_get_conversation_history(conversation_id)
+            async with self._lock_for(conversation_id):
+                return await self._async_process_turn(user_input, user_text, conversation_id)
+
+        except (GeminiAPIError, TimeoutError, OSError, ValueError) as err:
+            # Anything else is a bug and is left to Home Assistant to log
+            _LOGGER.error("Unexpected error during conversation: %s", err)
+            return ConversationResult(
+                response=_canned_response(
+                    user_input.language, "Sorry, I encountered an unexpected error."
+                ),
+                conversation_id=user_input.conversation_id,
+            )
+
+    def _lock_for(self, conversation_id: str) -> asyncio.Lock:
+        """Return the lock serializing turns of one conversation."""
+        lock = self._locks.get(conversation_id)
+        if lock is None:
+            lock = self._locks[conversation_id] = asyncio.Lock()
+        return lock
 
+    def _drop_lock(self, conversation_id: str) -> None:
+        """Forget a conversation's lock unless a turn still holds it."""
+        lock = self._locks.get(conversation_id)
+        if lock is not None and not lock.locked():
+            del self._locks[conversation_id]
+
+    async def _async_process_turn(
+        self,
+        user_input: ConversationInput,
+        user_text: str,
+        conversation_id: str,
+    ) -> ConversationResult:
+        """Answer one turn while holding its conversation's lock."""
+        # Load conversation history
+        conversation = await self._async_get_conversation(conversation_id)
+        conversation_history = _history_context(conversation)
+
+        # Answer repeated questions from the response cache
+        lower_text = unicodedata.normalize("NFC", user_text).lower()
+        cache_key = self._response_cache_key(lower_text, conversation_history)
+        response_text = self._response_cache.get(cache_key)
+
+        if response_text is None:
             # Check for specific intents first
-            intent_response = await self._process_intent(user_text, conversation_history)
+            intent_response = await self._process_intent(
+                user_text,
+                lower_text,
+                conversation_history,
+                user_input.language,
+                conversation_id,
+            )
             if intent_response:
                 # Update conversation history
-                conversation_history.append({"role": "user", "content": user_text})
-                conversation_history.append({"role": "assistant", "content": intent_response.response.speech.plain.speech})
-                await self._save_conversations()
-                
+                self._record_turn(
+                    conversation_id,
+                    conversation,
+                    user_text,
+                    intent_response.response.speech.plain.speech,
+                )
                 return intent_response
 
-            # Fall back to general conversation with Gemini
-            try:
-                response_text = await self._api_client.generate_content(
-                    model=self._model,
-                    prompt=user_text,
-                    system_prompt=self._system_prompt,
-                    conversation_history=conversation_history,
+        # Fall back to general conversation with Gemini
+        try:
+            if response_text is None:
+                response_text = await self._async_generate_reply(
+                    cache_key, user_text, conversation_history
                 )
 
-                if not response_text:
-                    response_text = "I'm sorry, I didn't understand that. Could you please rephrase?"
+            # Update conversation history
+            self._record_turn(conversation_id, conversation, user_text, response_text)
 
-                # Update conversation history
-                conversation_history.append({"role": "user", "content": user_text})
-                conversation_history.append({"role": "assistant", "content": response_text})
-                await self._save_conversations()
-
-                # Fire event for conversation response
-                self._hass.bus.async_fire(
-                    EVENT_CONVERSATION_RESPONSE,
-                    {
-                        "text": response_text,
-                        "conversation_id": conversation_id,
-                        "user_input": user_text,
-                    },
-                )
+            # Fire event for conversation response once the reply is returned,
+            # so slow listeners do not delay it
+            self._hass.loop.call_soon(
+                self._hass.bus.async_fire,
+                EVENT_CONVERSATION_RESPONSE,
+                {
+                    "text": response_text,
+                    "conversation_id": conversation_id,
+                    "user_input": user_text,
+                },
+            )
 
-                response = intent.IntentResponse(language=user_input.language)
-                response.async_set_speech(response_text)
-                return ConversationResult(
-                    response=response,
-                    conversation_id=conversation_id,
-                )
+            response = intent.IntentResponse(language=user_input.language)
+            response.async_set_speech(response_text)
+            return ConversationResult(
+                response=response,
+                conversation_id=conversation_id,
+            )
 
-            except GeminiAPIError as err:
-                _LOGGER.error("Error communicating with Gemini API: %s", err)
-                response = intent.IntentResponse(language=user_input.language)
-                response.async_set_speech(f"Sorry, I encountered an error: {str(err)}")
-                return ConversationResult(
-                    response=response,
-                    conversation_id=conversation_id,
-                )
-            
-        except Exception as err:
-            _LOGGER.error("Unexpected error during conversation: %s", err)
+        except GeminiAPIError as err:
+            _LOGGER.error("Error communicating with Gemini API: %s", err)
             response = intent.IntentResponse(language=user_input.language)
-            response.async_set_speech("Sorry, I encountered an unexpected error.")
+            response.async_set_speech(f"Sorry, I encountered an error: {str(err)}")
             return ConversationResult(
                 response=response,
-                conversation_id=user_input.conversation_id,
+                conversation_id=conversation_id,
             )
 
-    async def _process_intent(
+    def _response_cache_key(
+        self,
+        lower_text: str,
+        conversation_history: List[Dict[str, str]],
+    ) -> str:
+        """Return the response cache key for a normalized, lower-cased turn."""
+        return request_key(
+            "conversation",
+            self._model,
+            {
+                "system_prompt": self._system_prompt,
+                "text": lower_text,
+                "history": conversation_history[-RESPONSE_CACHE_HISTORY:],
+            },
+        )
+
+    async def _async_generate_reply(
         self,
+        cache_key: str,
         user_text: str,
         conversation_history: List[Dict[str, str]],
-    ) -> Optional[ConversationResult]:
-        """Process potential Home Assistant intents."""
-        # Basic intent detection based on keywords
-        lower_text = user_text.lower()
-        
-        # Home Assistant control intents
-        if any(word in lower_text for word in ["turn on", "turn off", "switch on", "switch off"]):
-            return await self._process_control_intent(user_text, conversation_history)
-        
-        # Weather intents
-        if any(word in lower_text for word in ["weather", "temperature", "forecast"]):
-            return await self._process_weather_intent(user_text, conversation_history)
-        
-        # Time/date intents
-        if any(word in lower_text for word in ["time", "date", "what time", "what day"]):
-            return await self._process_time_intent(user_text, conversation_history)
-        
-        # No specific intent detected
-        return None
+    ) -> str:
+        """Generate a reply, sharing one lookup between identical concurrent turns."""
+        return await self._api_client.coalesce(
+            cache_key,
+            self._async_fetch_reply,
+            cache_key,
+            user_text,
+            conversation_history,
+        )
 
-    async def _process_control_intent(
+    async def _async_fetch_reply(
         self,
+        cache_key: str,
         user_text: str,
         conversation_history: List[Dict[str, str]],
-    ) -> ConversationResult:
-        """Process device control intents."""
-        # Use Gemini to understand the intent and generate a structured response
-        control_prompt = f"""
-        You are a Home Assistant voice assistant. The user said: "{user_text}"
+    ) -> str:
+        """Answer from the semantic cache or ask Gemini for a new reply."""
+        # Reuse the reply to a paraphrase of a recent opening question
+        embedding = None if conversation_history else await self._embed(user_text)
+        response_text = self._semantic_lookup(embedding)
+        if response_text is not None:
+            return response_text
         
-        This appears to be a device control request. Please respond with:
-        1. A confirmation of what action you would take
-        2. Note that you're a demo integration and cannot actually control devices yet
+        response_text = await self._api_client.generate_content(
+            model=self._model,
+            prompt=user_text,
+            system_prompt=self._system_prompt,
+            conversation_history=conversation_history,
+        )
         
-        Be helpful and conversational.
-        """
+        if not response_text:
+            return "I'm sorry, I didn't understand that. Could you please rephrase?"
         
+        self._response_cache.set(cache_key, response_text)
+        self._semantic_store(embedding, response_text)
+        return response_text
+
+    async def _embed(self, text: str) -> Optional[array]:
+        """Return the unit-length embedding of text, or None if unavailable."""
         try:
-            response_text = await self._api_client.generate_content(
-                model=self._model,
-                prompt=control_prompt,
-                system_prompt=self._system_prompt,
-                conversation_history=conversation_history,
-            )
-            
-            response = intent.IntentResponse(language="en")
-            response.async_set_speech(response_text or "I understand you want to control a device, but I'm still learning how to do that.")
-            return ConversationResult(
-                response=response,
-                conversation_id=None,
-            )
-            
-        except Exception as err:
-            _LOGGER.error("Error processing control intent: %s", err)
-            response = intent.IntentResponse(language="en")
-            response.async_set_speech("I understand you want to control something, but I'm having trouble processing that right now.")
-            return ConversationResult(
-                response=response,
-                conversation_id=None,
-            )
+            return _unit_vector(await self._api_client.embed_content(text))
+        except GeminiAPIError as err:
+            _LOGGER.debug("Skipping semantic cache, embedding failed: %s", err)
+            return None
 
-    async def _process_weather_intent(
+    def _semantic_lookup(self, embedding: Optional[array]) -> Optional[str]:
+        """Return a cached reply to a sufficiently similar recent prompt."""
+        entries = self._semantic_cache
+        if embedding is None or not entries:
+            return None
+        
+        # Vectors are unit length, so the dot product is the cosine similarity
+        similarity, response_text = max(
+            (sum(map(operator.mul, vector, embedding)), text)
+            for vector, text in entries
+        )
+        return response_text if similarity >= SEMANTIC_CACHE_THRESHOLD else None
+
+    def _semantic_store(self, embedding: Optional[array], response_text: str) -> None:
+        """Remember a reply for later paraphrases of its prompt."""
+        if embedding is not None:
+            self._semantic_cache.append((embedding, response_text))
+
+    async def _process_intent(
         self,
         user_text: str,
+        lower_text: str,
         conversation_history: List[Dict[str, str]],
-    ) -> ConversationResult:
-        """Process weather-related intents."""
-        weather_prompt = f"""
-        You are a Home Assistant voice assistant. The user asked: "{user_text}"
+        language: str,
+        conversation_id: str,
+    ) -> Optional[ConversationResult]:
+        """Process potential Home Assistant intents."""
+        # Basic intent detection based on keywords
+        kind = _detect_intent(lower_text)
+        if kind is None:
+            # No specific intent detected
+            return None
         
-        This appears to be a weather request. Please respond helpfully, noting that:
-        1. You don't have access to current weather data in this demo
-        2. In a full integration, you could access Home Assistant's weather entities
-        3. Be conversational and suggest how they could get weather information
+        time_info = _time_info(datetime.datetime.now()) if kind == "time" else ""
         
-        Be helpful and friendly.
-        """
+        fields = {"user_text": user_text, "time_info": time_info}
+        _, prompt, empty_reply, error_reply = _INTENT_TABLE[kind]
+        if kind == "time" and lower_text.rstrip("?.! ") in _PLAIN_TIME_QUERIES:
+            # Gemini would only restate the clock, so answer locally
+            response_text = empty_reply.format_map(fields)
+        else:
+            try:
+                response_text = await self._api_client.generate_content(
+                    model=self._model,
+                    prompt=prompt.format_map(fields),
+                    system_prompt=self._intent_system_prompts[kind],
+                    conversation_history=conversation_history,
+                )
+            except Exception as err:
+                _LOGGER.error("Error processing %s intent: %s", kind, err)
+                response_text = error_reply.format_map(fields)
         
-        try:
-            response_text = await self._api_client.generate_content(
-                model=self._model,
-                prompt=weather_prompt,
-                system_prompt=self._system_prompt,
-                conversation_history=conversation_history,
-            )
-            
-            response = intent.IntentResponse(language="en")
-            response.async_set_speech(response_text or "I'd love to help with weather information, but I don't have access to weather data right now.")
-            return ConversationResult(
-                response=response,
-                conversation_id=None,
-            )
-            
-        except Exception as err:
-            _LOGGER.error("Error processing weather intent: %s", err)
-            response = intent.IntentResponse(language="en")
-            response.async_set_speech("I'd like to help with weather information, but I'm having trouble accessing that right now.")
-            return ConversationResult(
-                response=response,
-                conversation_id=None,
-            )
+        response = intent.IntentResponse(language=language)
+        response.async_set_speech(response_text or empty_reply.format_map(fields))
+        return ConversationResult(
+            response=response,
+            conversation_id=conversation_id,
+        )
 
-    async def _process_time_intent(
+    def _record_turn(
         self,
+        conversation_id: str,
+        conversation: Dict[str, Any],
         user_text: str,
-        conversation_history: List[Dict[str, str]],
-    ) -> ConversationResult:
-        """Process time/date related intents."""
-        import datetime
-        
-        current_time = datetime.datetime.now()
-        time_info = current_time.strftime("%I:%M %p on %A, %B %d, %Y")
+        response_text: str,
+    ) -> None:
+        """Append a turn and fold older turns into the summary when needed."""
+        turns = conversation["turns"]
+        turns.append({"role": "user", "content": user_text})
+        turns.append({"role": "assistant", "content": response_text})
+        self._schedule_save(conversation_id)
         
-        time_prompt = f"""
-        You are a Home Assistant voice assistant. The user asked: "{user_text}"
+        if conversation_id in self._summarizing:
+            # Trimming now would shift the turns being summarized
+            return
         
-        This appears to be a time/date request. The current time is: {time_info}
+        if len(turns) > HISTORY_STORED_MESSAGES:
+            # Summaries normally keep this short; cap growth when they fail
+            del turns[:-HISTORY_STORED_MESSAGES]
         
-        Please provide a natural, conversational response that includes the relevant time/date information.
-        """
+        # Summarize once there are too many turns or a few long ones, always
+        # leaving the most recent turns verbatim
+        if len(turns) > HISTORY_MAX_MESSAGES or (
+            len(turns) > HISTORY_KEEP_MESSAGES
+            and sum(len(turn["content"]) for turn in turns) > HISTORY_MAX_CHARS
+        ):
+            self._summarizing.add(conversation_id)
+            self._hass.async_create_background_task(
+                self._summarize(conversation_id, conversation),
+                "gemini_ai conversation summary",
+            )
+
+    async def _summarize(self, conversation_id: str, conversation: Dict[str, Any]) -> None:
+        """Replace older turns with an updated summary of them."""
+        older = conversation["turns"][:-HISTORY_KEEP_MESSAGES]
+        summary = conversation["summary"]
+        transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in older)
         
         try:
-            response_text = await self._api_client.generate_content(
+            new_summary = await self._api_client.generate_content(
                 model=self._model,
-                prompt=time_prompt,
-                system_prompt=self._system_prompt,
-                conversation_history=conversation_history,
-            )
-            
-            response = intent.IntentResponse(language="en")
-            response.async_set_speech(response_text or f"The current time is {time_info}.")
-            return ConversationResult(
-                response=response,
-                conversation_id=None,
-            )
-            
-        except Exception as err:
-            _LOGGER.error("Error processing time intent: %s", err)
-            response = intent.IntentResponse(language="en")
-            response.async_set_speech(f"The current time is {time_info}.")
-            return ConversationResult(
-                response=response,
-                conversation_id=None,
+                prompt=_SUMMARY_PROMPT.format(
+                    summary=f"Earlier summary: {summary}\n\n" if summary else "",
+                    transcript=transcript,
+                ),
             )
+        except GeminiAPIError as err:
+            _LOGGER.warning("Failed to summarize conversation history: %s", err)
+            return
+        finally:
+            self._summarizing.discard(conversation_id)
+        
+        if not new_summary:
+            return
+        
+        # Turns added while summarizing stay; only the summarized ones go
+        del conversation["turns"][:len(older)]
+        conversation["summary"] = new_summary.strip()
+        self._schedule_save(conversation_id)
 
-    async def _save_conversations(self) -> None:
-        """Save conversation history to storage."""
+    def _schedule_save(self, conversation_id: str) -> None:
+        """Write a conversation's history once a burst of turns settles."""
+        # Histories are capped and stored per conversation, so each write is
+        # already bounded by one short conversation; an append-only log would
+        # only trade Store's atomic writes for replay and compaction logic.
+        if conversation_id not in self._conversations:
+            return
+        self._unsaved.add(conversation_id)
+        self._conversation_store(conversation_id).async_delay_save(
+            functools.partial(self._conversation_data, conversation_id), HISTORY_SAVE_DELAY
+        )
+
+    def _conversation_data(self, conversation_id: str) -> Dict[str, Any]:
+        """Return a conversation for its pending write."""
+        self._unsaved.discard(conversation_id)
+        return self._conversations[conversation_id]
+
+    async def _save_conversations(self, conversation_ids: Optional[Iterable[str]] = None) -> None:
+        """Save conversation history to storage, by default all of it."""
+        if conversation_ids is None:
+            conversation_ids = self._conversations
+        conversation_ids = list(conversation_ids)
+        self._unsaved.difference_update(conversation_ids)
         try:
-            await self._store.async_save(self._conversations)
+            await asyncio.gather(
+                *(
+                    self._conversation_store(conversation_id).async_save(
+                        self._conversations[conversation_id]
+                    )
+                    for conversation_id in conversation_ids
+                    if conversation_id in self._conversations
+                ),
+                self._index_store.async_save(self._index_data()),
+            )
         except Exception as err:
             _LOGGER.warning("Failed to save conversation history: %s", err)
 
+    async def _async_get_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        """Return the stored conversation, creating it on first use."""
+        await self._conversations_loaded.wait()
+        
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            stored = None
+            if conversation_id in self._conversation_ids:
+                try:
+                    stored = await self._conversation_store(conversation_id).async_load()
+                except Exception as err:
+                    _LOGGER.warning("Failed to load conversation history: %s", err)
+            # Another turn may have loaded it while this one waited
+            conversation = self._conversations.setdefault(
+                conversation_id, stored or {"summary": "", "turns": []}
+            )
+            if conversation_id not in self._conversation_ids:
+                # The index only changes when a conversation is added or cleared
+                self._conversation_ids.add(conversation_id)
+                self._index_store.async_delay_save(self._index_data, HISTORY_SAVE_DELAY)
+        self._last_used[conversation_id] = time.monotonic()
+        return conversation
+
     async def async_get_conversation_history(
         self,
         conversation_id: str,
     ) -> List[Dict[str, str]]:
         """Get conversation history for a specific conversation ID."""
-        if not self._conversations_loaded:
-            await self._load_conversations()
-        
-        return self._conversations.get(conversation_id, [])
+        return _history_context(await self._async_get_conversation(conversation_id))
 
     async def async_clear_conversation_history(
         self,
         conversation_id: Optional[str] = None,
     ) -> None:
         """Clear conversation history for a specific conversation ID or all conversations."""
-        if not self._conversations_loaded:
-            await self._load_conversations()
+        await self._conversations_loaded.wait()
         
-        if conversation_id:
-            if conversation_id in self._conversations:
-                del self._conversations[conversation_id]
-        else:
-            self._conversations.clear()
+        conversation_ids = [conversation_id] if conversation_id else list(self._conversation_ids)
+        for conversation_id in conversation_ids:
+            self._conversation_ids.discard(conversation_id)
+            self._conversations.pop(conversation_id, None)
+            self._last_used.pop(conversation_id, None)
+            self._drop_lock(conversation_id)
+            self._unsaved.discard(conversation_id)
+            await self._conversation_store(conversation_id).async_remove()
+            del self._stores[conversation_id]
         
-        await self._save_conversations()
+        self._index_store.async_delay_save(self._index_data, HISTORY_SAVE_DELAY)
 
     async def async_will_remove_from_hass(self) -> None:
         """Clean up when entity is removed."""
-        await self._save_conversations() 
\ No newline at end of file
+        # Writing now replaces the pending delayed saves; untouched
+        # conversations are already on disk
+        await self._save_conversations(self._unsaved) 
\ No newline at end of file
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import logging
 import os
+import stat
 from typing import Any, Dict
 
 import voluptuous as vol
@@ -10,6 +11,7 @@ from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv
 
 from .api_client import GeminiAPIClient, GeminiAPIError
+from .cache import LRUTTLCache, request_key
 from .const import (
     DOMAIN,
     SERVICE_SAY,
@@ -23,18 +25,21 @@ from .const import (
     EVENT_STT_COMPLETE,
     EVENT_CONVERSATION_RESPONSE,
     EVENT_ERROR,
+    SPEECH_CACHE_SIZE,
+    SPEECH_CACHE_TTL,
+    SPEECH_CACHE_MEMORY_MB,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-# Service schemas
+# Service schemas; AVAILABLE_VOICES is a frozenset, so vol.In checks are O(1)
+_SPEED_VALIDATOR = vol.All(vol.Coerce(float), vol.Range(min=0.25, max=4.0))
+
 SAY_SERVICE_SCHEMA = vol.Schema(
     {
         vol.Required("message"): cv.string,
         vol.Optional("voice", default="Aoede"): vol.In(AVAILABLE_VOICES),
-        vol.Optional("speed", default=1.0): vol.All(
-            vol.Coerce(float), vol.Range(min=0.25, max=4.0)
-        ),
+        vol.Optional("speed", default=1.0): _SPEED_VALIDATOR,
         vol.Optional("cache", default=True): cv.boolean,
         vol.Optional("language", default="en"): cv.string,
     }
@@ -62,37 +67,82 @@ PREVIEW_VOICE_SERVICE_SCHEMA = vol.Schema(
     {
         vol.Required("voice"): vol.In(AVAILABLE_VOICES),
         vol.Optional("text", default="Hello, this is a voice preview."): cv.string,
-        vol.Optional("speed", default=1.0): vol.All(
-            vol.Coerce(float), vol.Range(min=0.25, max=4.0)
-        ),
+        vol.Optional("speed", default=1.0): _SPEED_VALIDATOR,
     }
 )
 
+# MIME types sent for transcribed files, by lower-cased extension
+_MIME_TYPE_BY_EXT = {
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".ogg": "audio/ogg",
+    ".flac": "audio/flac",
+    ".m4a": "audio/mp4",
+}
+
+
+def _read_audio_file(audio_file: str) -> bytes:
+    """Read an audio file after checking it exists and fits the size limit."""
+    try:
+        file_stat = os.stat(audio_file)
+    except FileNotFoundError:
+        file_stat = None
+    if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
+        raise ValueError(f"Audio file not found: {audio_file}")
+    
+    if file_stat.st_size > MAX_AUDIO_SIZE:
+        raise ValueError(f"Audio file too large: {file_stat.st_size} bytes (max: {MAX_AUDIO_SIZE})")
+    
+    with open(audio_file, "rb") as f:
+        return f.read()
+
+
+def _fire_error(hass: HomeAssistant, service: str, error: str, **context: Any) -> None:
+    """Fire the error event for a failed service call once the handler returns."""
+    hass.loop.call_soon(
+        hass.bus.async_fire,
+        EVENT_ERROR,
+        {"service": service, "error": error, **context},
+    )
+
 
 async def async_register_services(hass: HomeAssistant, api_client: GeminiAPIClient) -> None:
     """Register services for Gemini AI integration."""
+    # Recent service audio, so repeated announcements skip the round-trip
+    speech_cache = LRUTTLCache(
+        max_size=SPEECH_CACHE_SIZE,
+        ttl=SPEECH_CACHE_TTL,
+        max_memory_mb=SPEECH_CACHE_MEMORY_MB,
+    )
     
     async def say_service(call: ServiceCall) -> None:
         """Handle the say service call."""
         try:
+            # The schema fills in defaults, so every key is present
             message = call.data["message"]
-            voice = call.data.get("voice", "Aoede")
-            speed = call.data.get("speed", 1.0)
-            language = call.data.get("language", "en")
-            use_cache = call.data.get("cache", True)
+            voice = call.data["voice"]
+            speed = call.data["speed"]
+            language = call.data["language"]
+            use_cache = call.data["cache"]
             
             _LOGGER.debug("Say service called: message='%s', voice='%s'", message[:50], voice)
             
             # Generate speech
-            audio_data = await api_client.synthesize_speech(
-                model="gemini-2.0-flash-exp",  # Use TTS model
-                text=message,
-                voice=voice,
-                speed=speed,
-            )
+            cache_key = request_key(SERVICE_SAY, voice, {"text": message, "speed": speed})
+            audio_data = speech_cache.get(cache_key) if use_cache else None
+            if audio_data is None:
+                audio_data = await api_client.synthesize_speech(
+                    model="gemini-2.0-flash-exp",  # Use TTS model
+                    text=message,
+                    voice=voice,
+                    speed=speed,
+                )
+                if use_cache:
+                    speech_cache.set(cache_key, audio_data)
             
-            # Fire completion event
-            hass.bus.async_fire(
+            # Fire completion event once the handler has returned
+            hass.loop.call_soon(
+                hass.bus.async_fire,
                 EVENT_TTS_COMPLETE,
                 {
                     "message": message,
@@ -108,24 +158,15 @@ async def async_register_services(hass: HomeAssistant, api_client: GeminiAPIClie
             
         except GeminiAPIError as err:
             _LOGGER.error("Gemini API error in say service: %s", err)
-            hass.bus.async_fire(
-                EVENT_ERROR,
-                {
-                    "service": SERVICE_SAY,
-                    "error": str(err),
-                    "message": call.data.get("message", ""),
-                },
-            )
+            _fire_error(hass, SERVICE_SAY, str(err), message=call.data.get("message", ""))
             
         except Exception as err:
             _LOGGER.error("Unexpected error in say service: %s", err)
-            hass.bus.async_fire(
-                EVENT_ERROR,
-                {
-                    "service": SERVICE_SAY,
-                    "error": f"Unexpected error: {str(err)}",
-                    "message": call.data.get("message", ""),
-                },
+            _fire_error(
+                hass,
+                SERVICE_SAY,
+                f"Unexpected error: {err}",
+                message=call.data.get("message", ""),
             )
 
     async def transcribe_service(call: ServiceCall) -> None:
@@ -137,28 +178,13 @@ async def async_register_services(hass: HomeAssistant, api_client: GeminiAPIClie
             
             _LOGGER.debug("Transcribe service called: file='%s'", audio_file)
             
-            # Validate file exists and size
-            if not os.path.isfile(audio_file):
-                raise ValueError(f"Audio file not found: {audio_file}")
-            
-            file_size = os.path.getsize(audio_file)
-            if file_size > MAX_AUDIO_SIZE:
-                raise ValueError(f"Audio file too large: {file_size} bytes (max: {MAX_AUDIO_SIZE})")
-            
-            # Read audio file
-            with open(audio_file, "rb") as f:
-                audio_data = f.read()
+            # Validate and read the file off the event loop
+            audio_data = await hass.async_add_executor_job(_read_audio_file, audio_file)
+            file_size = len(audio_data)
             
             # Determine MIME type from file extension
             file_ext = os.path.splitext(audio_file)[1].lower()
-            mime_type_mapping = {
-                ".wav": "audio/wav",
-                ".mp3": "audio/mpeg",
-                ".ogg": "audio/ogg",
-                ".flac": "audio/flac",
-                ".m4a": "audio/mp4",
-            }
-            mime_type = mime_type_mapping.get(file_ext, "audio/wav")
+            mime_type = _MIME_TYPE_BY_EXT.get(file_ext, "audio/wav")
             
             # Transcribe audio
             transcription = await api_client.transcribe_audio(
@@ -168,8 +194,9 @@ async def async_register_services(hass: HomeAssistant, api_client: GeminiAPIClie
                 language=language,
             )
             
-            # Fire completion event
-            hass.bus.async_fire(
+            # Fire completion event once the handler has returned
+            hass.loop.call_soon(
+                hass.bus.async_fire,
                 EVENT_STT_COMPLETE,
                 {
                     "audio_file": audio_file,
@@ -185,47 +212,44 @@ async def async_register_services(hass: HomeAssistant, api_client: GeminiAPIClie
             
         except GeminiAPIError as err:
             _LOGGER.error("Gemini API error in transcribe service: %s", err)
-            hass.bus.async_fire(
-                EVENT_ERROR,
-                {
-                    "service": SERVICE_TRANSCRIBE,
-                    "error": str(err),
-                    "audio_file": call.data.get("audio_file", ""),
-                },
+            _fire_error(
+                hass,
+                SERVICE_TRANSCRIBE,
+                str(err),
+                audio_file=call.data.get("audio_file", ""),
             )
             
         except Exception as err:
             _LOGGER.error("Unexpected error in transcribe service: %s", err)
-            hass.bus.async_fire(
-                EVENT_ERROR,
-                {
-                    "service": SERVICE_TRANSCRIBE,
-                    "error": f"Unexpected error: {str(err)}",
-                    "audio_file": call.data.get("audio_file", ""),
-                },
+            _fire_error(
+                hass,
+                SERVICE_TRANSCRIBE,
+                f"Unexpected error: {err}",
+                audio_file=call.data.get("audio_file", ""),
             )
 
     async def process_service(call: ServiceCall) -> None:
         """Handle the process service call."""
         try:
             text = call.data["text"]
-            conversation_id = call.data.get("conversation_id", "default")
+            conversation_id = call.data["conversation_id"]
             system_prompt = call.data.get("system_prompt")
-            language = call.data.get("language", "en")
+            language = call.data["language"]
             model = call.data.get("model", "gemini-2.0-flash")
             
             _LOGGER.debug("Process service called: text='%s', conversation_id='%s'", text[:50], conversation_id)
             
-            # Generate response
-            response = await api_client.generate_content(
+            # Generate response; the service keeps no history, so calls that
+            # fire together (e.g. several automations) share one request
+            response = await api_client.generate_content_batched(
                 model=model,
                 prompt=text,
                 system_prompt=system_prompt,
-                conversation_history=None,  # Service doesn't maintain history
             )
             
-            # Fire completion event
-            hass.bus.async_fire(
+            # Fire completion event once the handler has returned
+            hass.loop.call_soon(
+                hass.bus.async_fire,
                 EVENT_CONVERSATION_RESPONSE,
                 {
                     "conversation_id": conversation_id,
@@ -241,42 +265,43 @@ async def async_register_services(hass: HomeAssistant, api_client: GeminiAPIClie
             
         except GeminiAPIError as err:
             _LOGGER.error("Gemini API error in process service: %s", err)
-            hass.bus.async_fire(
-                EVENT_ERROR,
-                {
-                    "service": SERVICE_PROCESS,
-                    "error": str(err),
-                    "text": call.data.get("text", ""),
-                    "conversation_id": call.data.get("conversation_id", ""),
-                },
+            _fire_error(
+                hass,
+                SERVICE_PROCESS,
+                str(err),
+                text=call.data.get("text", ""),
+                conversation_id=call.data.get("conversation_id", ""),
             )
             
         except Exception as err:
             _LOGGER.error("Unexpected error in process service: %s", err)
-            hass.bus.async_fire(
-                EVENT_ERROR,
-                {
-                    "service": SERVICE_PROCESS,
-                    "error": f"Unexpected error: {str(err)}",
-                    "text": call.data.get("text", ""),
-                    "conversation_id": call.data.get("conversation_id", ""),
-                },
+            _fire_error(
+                hass,
+                SERVICE_PROCESS,
+                f"Unexpected error: {err}",
+                text=call.data.get("text", ""),
+                conversation_id=call.data.get("conversation_id", ""),
             )
 
     async def preview_voice_service(call: ServiceCall) -> None:
         """Handle the preview voice service call."""
         try:
             voice = call.data["voice"]
-            text = call.data.get("text", "Hello, this is a voice preview.")
-            speed = call.data.get("speed", 1.0)
+            text = call.data["text"]
+            speed = call.data["speed"]
             
             _LOGGER.debug("Preview voice service called: voice='%s'", voice)
             
             # Generate voice preview
-            audio_data = await api_client.preview_voice(voice, text)
+            cache_key = request_key(SERVICE_PREVIEW_VOICE, voice, {"text": text})
+            audio_data = speech_cache.get(cache_key)
+            if audio_data is None:
+                audio_data = await api_client.preview_voice(voice, text)
+                speech_cache.set(cache_key, audio_data)
             
-            # Fire completion event
-            hass.bus.async_fire(
+            # Fire completion event once the handler has returned
+            hass.loop.call_soon(
+                hass.bus.async_fire,
                 EVENT_TTS_COMPLETE,
                 {
                     "message": text,
@@ -293,24 +318,15 @@ async def async_register_services(hass: HomeAssistant, api_client: GeminiAPIClie
             
         except GeminiAPIError as err:
             _LOGGER.error("Gemini API error in preview voice service: %s", err)
-            hass.bus.async_fire(
-                EVENT_ERROR,
-                {
-                    "service": SERVICE_PREVIEW_VOICE,
-                    "error": str(err),
-                    "voice": call.data.get("voice", ""),
-                },
-            )
+            _fire_error(hass, SERVICE_PREVIEW_VOICE, str(err), voice=call.data.get("voice", ""))
             
         except Exception as err:
             _LOGGER.error("Unexpected error in preview voice service: %s", err)
-            hass.bus.async_fire(
-                EVENT_ERROR,
-                {
-                    "service": SERVICE_PREVIEW_VOICE,
-                    "error": f"Unexpected error: {str(err)}",
-                    "voice": call.data.get("voice", ""),
-                },
+            _fire_error(
+                hass,
+                SERVICE_PREVIEW_VOICE,
+                f"Unexpected error: {err}",
+                voice=call.data.get("voice", ""),
             )
 
     # Register services
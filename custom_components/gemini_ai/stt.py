@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import operator
 import os
-from typing import Any, AsyncIterable, Dict, Optional
+import struct
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional
 
 from homeassistant.components.stt import (
     SpeechMetadata,
@@ -14,21 +17,141 @@ from homeassistant.components.stt import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.storage import Store
 
 from .api_client import GeminiAPIClient, GeminiAPIError
+from .audio import wav_header
+from .cache import LRUTTLCache
 from .const import (
     CONF_STT_MODEL,
     CONF_LANGUAGE,
     DEFAULT_STT_MODEL,
     DEFAULT_LANGUAGE,
     SUPPORTED_AUDIO_FORMATS,
+    SUPPORTED_LANGUAGES,
     MAX_AUDIO_SIZE,
     AUDIO_CHUNK_SIZE,
+    SILENCE_RMS_THRESHOLD,
+    SPLIT_PAUSE_MS,
+    TRANSCRIPT_CACHE_SIZE,
+    TRANSCRIPT_CACHE_TTL,
+    CACHE_SAVE_DELAY,
     DOMAIN,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Audio is scanned for pauses in 20 ms frames
+_FRAME_MS = 20
+_PAUSE_FRAMES = SPLIT_PAUSE_MS // _FRAME_MS
+_SILENCE_POWER = SILENCE_RMS_THRESHOLD ** 2
+
+
+# Format assumed for raw PCM without a RIFF header
+_STREAM_FORMAT = (16000, 1, 16)  # sample rate, channels, bits per sample
+
+
+def _wav_payload(audio: memoryview) -> tuple[memoryview, tuple[int, int, int]]:
+    """Return the PCM samples of WAV audio and their format.
+
+    Raw PCM without a RIFF header is returned unchanged, in the stream format.
+    """
+    audio = memoryview(audio).cast("B")
+    if len(audio) < 12 or audio[:4] != b"RIFF" or audio[8:12] != b"WAVE":
+        return audio, _STREAM_FORMAT
+    
+    wav_format = _STREAM_FORMAT
+    offset = 12
+    while offset + 8 <= len(audio):
+        chunk_id = audio[offset:offset + 4]
+        size = int.from_bytes(audio[offset + 4:offset + 8], "little")
+        body = offset + 8
+        if chunk_id == b"fmt " and size >= 16:
+            channels, sample_rate = struct.unpack_from("<HI", audio, body + 2)
+            bits_per_sample = struct.unpack_from("<H", audio, body + 14)[0]
+            wav_format = (sample_rate, channels, bits_per_sample)
+        elif chunk_id == b"data":
+            return audio[body:body + size], wav_format
+        offset = body + size + (size & 1)  # Chunks are padded to even sizes
+    
+    return audio[offset:], wav_format
+
+
+def _is_silent(samples: memoryview) -> bool:
+    """Return True if the mean power of the samples is below the threshold."""
+    return sum(map(operator.mul, samples, samples)) < _SILENCE_POWER * len(samples)
+
+
+def _split_on_silence(
+    audio: memoryview,
+    max_size: int,
+    wav_format: tuple[int, int, int] = _STREAM_FORMAT,
+) -> list[memoryview]:
+    """Split PCM audio into pieces of at most max_size bytes, cutting at pauses.
+
+    Each piece ends at the last pause before the size limit, or at the limit
+    itself if there was no pause, so words are not cut in half. Pieces that
+    are silent throughout are dropped, as transcribing them returns nothing.
+    Pauses are only detected in 16-bit audio; other sample widths are split
+    by size alone, on whole sample frames.
+    """
+    sample_rate, channels, bits_per_sample = wav_format
+    block_align = max(1, channels * bits_per_sample // 8)
+    audio = memoryview(audio).cast("B")
+    audio = audio[:len(audio) // block_align * block_align]
+    
+    if bits_per_sample != 16:
+        step = max(block_align, max_size // block_align * block_align)
+        return [audio[start:start + step] for start in range(0, len(audio), step)]
+    
+    samples = audio.cast("h")
+    frame_samples = max(1, sample_rate * _FRAME_MS // 1000) * channels
+    frame_bytes = frame_samples * 2
+    chunks = []
+    start = 0
+    pause = None
+    silent_frames = 0
+    voiced_end = 0  # End of the last frame with sound in it
+    voiced_before_pause = 0
+    
+    for offset in range(0, len(samples), frame_samples):
+        end = min(offset * 2 + frame_bytes, len(audio))
+        if _is_silent(samples[offset:offset + frame_samples]):
+            silent_frames += 1
+            if silent_frames >= _PAUSE_FRAMES:
+                pause = end
+                voiced_before_pause = voiced_end
+        else:
+            silent_frames = 0
+            voiced_end = end
+        
+        if end - start + frame_bytes > max_size:
+            if pause is not None and pause > start:
+                cut, voiced = pause, voiced_before_pause > start
+            else:
+                cut, voiced = end, voiced_end > start
+            if voiced:
+                chunks.append(audio[start:cut])
+            start = cut
+            pause = None
+    
+    if start < len(audio) and voiced_end > start:
+        chunks.append(audio[start:])
+    return chunks
+
+
+def _read_audio_file(file_path: str) -> bytes:
+    """Read an audio file after checking it exists and fits the size limit."""
+    if not os.path.isfile(file_path):
+        raise ValueError(f"File not found: {file_path}")
+    
+    file_size = os.path.getsize(file_path)
+    if file_size > MAX_AUDIO_SIZE:
+        raise ValueError(f"File too large: {file_size} bytes")
+    
+    with open(file_path, "rb") as file:
+        return file.read()
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -69,6 +192,27 @@ class GeminiSTTEntity(SpeechToTextEntity):
         # STT settings
         self._model = config.get(CONF_STT_MODEL, DEFAULT_STT_MODEL)
         self._language = config.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
+        
+        # Transcripts of recently heard audio, so replayed prompts skip the API
+        self._store = Store(hass, 1, f"gemini_ai_stt_cache_{entry_id}")
+        self._transcripts = LRUTTLCache(
+            max_size=TRANSCRIPT_CACHE_SIZE,
+            ttl=TRANSCRIPT_CACHE_TTL,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Restore cached transcripts when added to Home Assistant."""
+        await super().async_added_to_hass()
+        try:
+            stored_cache = await self._store.async_load()
+            if stored_cache:
+                self._transcripts.load(stored_cache)
+        except Exception as err:
+            _LOGGER.warning("Failed to load STT cache: %s", err)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Write pending transcripts to storage."""
+        await self._store.async_save(self._transcripts.as_dict())
 
     @property
     def name(self) -> str:
@@ -81,19 +225,9 @@ class GeminiSTTEntity(SpeechToTextEntity):
         return f"{DOMAIN}_{self._entry_id}_stt"
 
     @property
-    def supported_languages(self) -> list[str]:
+    def supported_languages(self) -> tuple[str, ...]:
         """Return list of supported languages."""
-        # Gemini supports many languages for STT
-        return [
-            "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh",
-            "ar", "hi", "th", "vi", "tr", "pl", "nl", "sv", "da", "no",
-            "fi", "cs", "hu", "ro", "bg", "hr", "sk", "sl", "et", "lv",
-            "lt", "mt", "ga", "is", "mk", "sq", "sr", "bs", "me", "uk",
-            "be", "kk", "ky", "uz", "tg", "mn", "ka", "hy", "az", "eu",
-            "ca", "gl", "cy", "br", "co", "eo", "ia", "ie", "ig", "mg",
-            "mi", "ms", "sw", "zu", "xh", "af", "am", "bn", "gu", "he",
-            "kn", "ml", "mr", "ne", "or", "pa", "si", "ta", "te", "ur"
-        ]
+        return SUPPORTED_LANGUAGES
 
     @property
     def default_language(self) -> str:
@@ -156,6 +290,10 @@ class GeminiSTTEntity(SpeechToTextEntity):
             # Use WAV format
             mime_type = "audio/wav"
             
+            # Hand the buffer on without copying it into bytes; chunks are
+            # zero-copy slices of it
+            audio = memoryview(audio_data)
+            
             _LOGGER.debug(
                 "Processing audio: %d bytes, language: %s",
                 len(audio_data),
@@ -163,21 +301,7 @@ class GeminiSTTEntity(SpeechToTextEntity):
             )
             
             # Process audio data
-            if len(audio_data) > AUDIO_CHUNK_SIZE:
-                # For large files, process in chunks
-                text = await self._process_large_audio(
-                    bytes(audio_data),
-                    mime_type,
-                    metadata.language,
-                )
-            else:
-                # Process as single chunk
-                text = await self._api_client.transcribe_audio(
-                    model=self._model,
-                    audio_data=bytes(audio_data),
-                    mime_type=mime_type,
-                    language=metadata.language,
-                )
+            text = await self._transcribe(audio, mime_type, metadata.language)
             
             if text:
                 _LOGGER.debug("Transcription result: %s", text[:100])
@@ -206,53 +330,106 @@ class GeminiSTTEntity(SpeechToTextEntity):
                 result=SpeechResult.ResultType.ERROR,
             )
 
+    async def _transcribe(
+        self,
+        audio_data: bytes | memoryview,
+        mime_type: str,
+        language: str,
+    ) -> str:
+        """Transcribe audio, reusing the transcript of identical earlier audio."""
+        hasher = hashlib.blake2b(audio_data, digest_size=16)
+        hasher.update(f"\0{self._model}\0{language}".encode())
+        cache_key = hasher.hexdigest()
+        
+        text = self._transcripts.get(cache_key)
+        if text is not None:
+            _LOGGER.debug("Reusing cached transcription")
+            return text
+        
+        if len(audio_data) > AUDIO_CHUNK_SIZE:
+            # For large files, process in chunks; a chunk that failed leaves a
+            # gap, so these transcripts are not cached
+            text = await self._process_large_audio(audio_data, mime_type, language)
+            return text.strip() if text else ""
+        
+        # Process as single chunk
+        text = await self._api_client.transcribe_audio(
+            model=self._model,
+            audio_data=audio_data,
+            mime_type=mime_type,
+            language=language,
+        )
+        
+        text = text.strip() if text else ""
+        if text:
+            self._transcripts.set(cache_key, text)
+            self._store.async_delay_save(self._transcripts.as_dict, CACHE_SAVE_DELAY)
+        return text
+
     async def _process_large_audio(
         self,
-        audio_data: bytes,
+        audio_data: bytes | memoryview,
         mime_type: str,
         language: str,
     ) -> str:
         """Process large audio files by chunking."""
-        chunks = []
-        chunk_size = AUDIO_CHUNK_SIZE
+        transcription_parts: Dict[int, str] = {}
+        async for index, text in self._iter_large_audio(audio_data, mime_type, language):
+            if text and text.strip():
+                transcription_parts[index] = text.strip()
         
-        # Split audio into chunks
-        for i in range(0, len(audio_data), chunk_size):
-            chunk = audio_data[i:i + chunk_size]
-            chunks.append(chunk)
-        
-        _LOGGER.debug("Processing large audio in %d chunks", len(chunks))
+        # Combine results in chunk order
+        return " ".join(transcription_parts[index] for index in sorted(transcription_parts))
+
+    async def _iter_large_audio(
+        self,
+        audio_data: bytes | memoryview,
+        mime_type: str,
+        language: str,
+    ) -> AsyncIterator[tuple[int, str]]:
+        """Transcribe large audio in chunks, yielding (index, text) as each finishes."""
+        # Split only the samples, so no header ends up inside a chunk
+        pcm, wav_format = _wav_payload(audio_data)
         
-        # Process chunks concurrently with a semaphore to limit concurrent requests
-        semaphore = asyncio.Semaphore(3)  # Limit to 3 concurrent requests
+        # Split audio at pauses so no chunk cuts a word in half; scanning
+        # every sample takes a while, so keep it off the event loop
+        chunks = await self._hass.async_add_executor_job(
+            _split_on_silence, pcm, AUDIO_CHUNK_SIZE, wav_format
+        )
         
-        async def process_chunk(chunk_data: bytes) -> str:
-            async with semaphore:
-                try:
-                    return await self._api_client.transcribe_audio(
-                        model=self._model,
-                        audio_data=chunk_data,
-                        mime_type=mime_type,
-                        language=language,
-                    )
-                except Exception as err:
-                    _LOGGER.warning("Error processing audio chunk: %s", err)
-                    return ""
+        _LOGGER.debug("Processing large audio in %d chunks", len(chunks))
         
-        # Process all chunks
-        tasks = [process_chunk(chunk) for chunk in chunks]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Process chunks concurrently; the client's transcription slots and
+        # per-minute budget bound how many are in flight and retry throttled
+        # ones. Each chunk is sent as a complete WAV file with its own header
+        async def process_chunk(index: int, chunk_data: memoryview) -> tuple[int, str]:
+            wav = b"".join((wav_header(len(chunk_data), *wav_format), chunk_data))
+            return index, await transcribe_chunk(wav)
         
-        # Combine results
-        transcription_parts = []
-        for result in results:
-            if isinstance(result, Exception):
-                _LOGGER.warning("Chunk processing failed: %s", result)
-                continue
-            if result and result.strip():
-                transcription_parts.append(result.strip())
+        async def transcribe_chunk(chunk_data: bytes) -> str:
+            try:
+                return await self._api_client.transcribe_audio(
+                    model=self._model,
+                    audio_data=chunk_data,
+                    mime_type=mime_type,
+                    language=language,
+                )
+            except Exception as err:
+                _LOGGER.warning("Error processing audio chunk: %s", err)
+                return ""
         
-        return " ".join(transcription_parts)
+        # Hand back each chunk as soon as it is done; if the caller stops
+        # early or is cancelled, the chunks still pending are cancelled
+        tasks = [
+            self._hass.async_create_task(process_chunk(index, chunk))
+            for index, chunk in enumerate(chunks)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def async_transcribe_file(
         self,
@@ -261,18 +438,8 @@ class GeminiSTTEntity(SpeechToTextEntity):
     ) -> str:
         """Transcribe audio file directly."""
         try:
-            # Check if file exists and is readable
-            if not os.path.isfile(file_path):
-                raise ValueError(f"File not found: {file_path}")
-            
-            # Check file size
-            file_size = os.path.getsize(file_path)
-            if file_size > MAX_AUDIO_SIZE:
-                raise ValueError(f"File too large: {file_size} bytes")
-            
-            # Read audio file
-            with open(file_path, "rb") as file:
-                audio_data = file.read()
+            # Validate and read the file off the event loop
+            audio_data = await self._hass.async_add_executor_job(_read_audio_file, file_path)
             
             # Use WAV format
             mime_type = "audio/wav"
@@ -290,17 +457,7 @@ class GeminiSTTEntity(SpeechToTextEntity):
             )
             
             # Process audio
-            if len(audio_data) > AUDIO_CHUNK_SIZE:
-                text = await self._process_large_audio(audio_data, mime_type, language)
-            else:
-                text = await self._api_client.transcribe_audio(
-                    model=self._model,
-                    audio_data=audio_data,
-                    mime_type=mime_type,
-                    language=language,
-                )
-            
-            return text.strip() if text else ""
+            return await self._transcribe(audio_data, mime_type, language)
             
         except Exception as err:
             _LOGGER.error("Error transcribing file %s: %s", file_path, err)
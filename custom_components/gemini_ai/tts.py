@@ -2,17 +2,27 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
+import functools
 import hashlib
+import heapq
 import logging
-from typing import Any, Dict, Optional
+import os
+from pathlib import Path
+import struct
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, Optional
 
 from homeassistant.components.tts import CONF_LANG, TextToSpeechEntity, Voice
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.storage import Store
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 
 from .api_client import GeminiAPIClient, GeminiAPIError
+from .audio import wav_header
+from .cache import LRUTTLCache
 from .const import (
     CONF_TTS_MODEL,
     CONF_DEFAULT_VOICE,
@@ -24,14 +34,48 @@ from .const import (
     DEFAULT_VOICE_SPEED,
     DEFAULT_VOICE_PITCH,
     DEFAULT_LANGUAGE,
-    AVAILABLE_VOICES,
+    AVAILABLE_VOICES_SORTED,
+    SUPPORTED_LANGUAGES,
     DOMAIN,
     CACHE_TTL,
     MAX_CACHE_SIZE,
+    TTS_CACHE_SAVE_DELAY,
+    TTS_CACHE_SWEEP_INSERTS,
+    TTS_CACHE_MAX_HITS,
+    TTS_MEMORY_CACHE_SIZE,
+    TTS_MEMORY_CACHE_MB,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# The voice set is fixed, so the entries are built once and shared
+_VOICES = [Voice(voice_id=voice, name=voice) for voice in AVAILABLE_VOICES_SORTED]
+
+
+# Placeholder silence is 22.05 kHz mono 16-bit, in blocks of 1024 samples
+_SILENCE_SAMPLE_RATE = 22050
+_SILENCE_BLOCK = 1024
+
+
+@functools.lru_cache(maxsize=64)
+def _wav_silence(num_samples: int) -> bytes:
+    """Return a WAV file holding num_samples samples of silence."""
+    data_size = num_samples * 2  # 16-bit mono
+    
+    # bytes(n) allocates an already zeroed buffer
+    return wav_header(data_size, _SILENCE_SAMPLE_RATE) + bytes(data_size)
+
+
+@functools.lru_cache(maxsize=512)
+def _message_digest(message: str) -> bytes:
+    """Return a fixed-size digest of a message, remembered for repeated phrases.
+
+    The message is NFKC-normalized and its whitespace collapsed first, so
+    variants that are spoken the same way share one cache entry.
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", message).split())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -72,16 +116,26 @@ class GeminiTTSEntity(TextToSpeechEntity):
         # TTS settings
         self._model = config.get(CONF_TTS_MODEL, DEFAULT_TTS_MODEL)
         self._default_voice = config.get(CONF_DEFAULT_VOICE, DEFAULT_VOICE)
-        self._default_speed = config.get(CONF_VOICE_SPEED, DEFAULT_VOICE_SPEED)
-        self._default_pitch = config.get(CONF_VOICE_PITCH, DEFAULT_VOICE_PITCH)
+        self._default_speed = float(config.get(CONF_VOICE_SPEED, DEFAULT_VOICE_SPEED))
+        self._default_pitch = float(config.get(CONF_VOICE_PITCH, DEFAULT_VOICE_PITCH))
         self._language = config.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
         
-        # Cache setup
+        # Cache setup: the store holds only metadata per cache key, the audio
+        # itself lives in one raw file per key
         self._store = Store(hass, 1, f"gemini_ai_tts_cache_{entry_id}")
-        self._cache: Dict[str, Any] = {}
-        self._cache_loaded = False
+        self._audio_dir = Path(hass.config.path(STORAGE_DIR, f"gemini_ai_tts_audio_{entry_id}"))
+        # Least recently used first
+        self._cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        # The most recently played clips stay in memory, so replays skip the disk
+        self._hot_audio = LRUTTLCache(
+            max_size=TTS_MEMORY_CACHE_SIZE,
+            ttl=CACHE_TTL,
+            max_memory_mb=TTS_MEMORY_CACHE_MB,
+        )
+        self._cache_loaded = asyncio.Event()
+        self._inserts_since_sweep = 0
         
-        # Load cache on startup
+        # Load cache on startup; requests arriving meanwhile wait for it
         hass.async_create_task(self._load_cache())
 
     async def _load_cache(self) -> None:
@@ -89,11 +143,37 @@ class GeminiTTSEntity(TextToSpeechEntity):
         try:
             stored_cache = await self._store.async_load()
             if stored_cache:
-                self._cache = stored_cache
-            self._cache_loaded = True
+                # Keep only entries whose audio file is still on disk
+                on_disk = await self._hass.async_add_executor_job(
+                    self._scan_audio_dir, set(stored_cache)
+                )
+                self._cache = OrderedDict(
+                    (key, entry) for key, entry in stored_cache.items() if key in on_disk
+                )
+                # Have the usual announcements ready before they are next played
+                self._hass.async_create_background_task(
+                    self._warm_hot_audio(), "gemini_ai tts warmup"
+                )
         except Exception as err:
             _LOGGER.warning("Failed to load TTS cache: %s", err)
-            self._cache_loaded = True
+        finally:
+            self._cache_loaded.set()
+
+    async def _warm_hot_audio(self) -> None:
+        """Read the most played cached clips into memory."""
+        played = [key for key, entry in self._cache.items() if entry.get("hits", 0)]
+        keys = heapq.nlargest(
+            TTS_MEMORY_CACHE_SIZE, played, key=lambda k: self._cache[k].get("hits", 0)
+        )
+        if not keys:
+            return
+        
+        clips = await self._hass.async_add_executor_job(self._read_audio, keys)
+        for key, audio_data in clips.items():
+            # Skip clips evicted or played while they were being read
+            if key in self._cache and self._hot_audio.peek(key) is None:
+                self._hot_audio.set(key, audio_data)
+        _LOGGER.debug("Preloaded %d frequently played TTS clips", len(clips))
 
     @property
     def name(self) -> str:
@@ -106,19 +186,9 @@ class GeminiTTSEntity(TextToSpeechEntity):
         return f"{DOMAIN}_{self._entry_id}_tts"
 
     @property
-    def supported_languages(self) -> list[str]:
+    def supported_languages(self) -> tuple[str, ...]:
         """Return list of supported languages."""
-        # Gemini supports many languages, return common ones
-        return [
-            "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh",
-            "ar", "hi", "th", "vi", "tr", "pl", "nl", "sv", "da", "no",
-            "fi", "cs", "hu", "ro", "bg", "hr", "sk", "sl", "et", "lv",
-            "lt", "mt", "ga", "is", "mk", "sq", "sr", "bs", "me", "uk",
-            "be", "kk", "ky", "uz", "tg", "mn", "ka", "hy", "az", "eu",
-            "ca", "gl", "cy", "br", "co", "eo", "ia", "ie", "ig", "mg",
-            "mi", "ms", "sw", "zu", "xh", "af", "am", "bn", "gu", "he",
-            "kn", "ml", "mr", "ne", "or", "pa", "si", "ta", "te", "ur"
-        ]
+        return SUPPORTED_LANGUAGES
 
     @property
     def default_language(self) -> str:
@@ -132,18 +202,12 @@ class GeminiTTSEntity(TextToSpeechEntity):
 
     def get_supported_voices(self, language: str) -> list[Voice]:
         """Return list of supported voices for given language."""
-        return [
-            Voice(voice_id=voice, name=voice)
-            for voice in AVAILABLE_VOICES
-        ]
+        return _VOICES
 
     @property
     def supported_voices(self) -> list[Voice]:
         """Return list of supported voices (sync property for WebSocket API)."""
-        return [
-            Voice(voice_id=voice, name=voice)
-            for voice in AVAILABLE_VOICES
-        ]
+        return _VOICES
 
     async def async_get_tts_audio(
         self,
@@ -152,28 +216,31 @@ class GeminiTTSEntity(TextToSpeechEntity):
         options: Dict[str, Any] | None = None,
     ) -> tuple[str, bytes]:
         """Load TTS from Gemini AI."""
-        if not self._cache_loaded:
-            await self._load_cache()
-            
-        # Parse options
-        if options is None:
-            options = {}
+        await self._cache_loaded.wait()
             
-        voice = options.get("voice", self._default_voice)
-        speed = float(options.get("speed", self._default_speed))
-        pitch = float(options.get("pitch", self._default_pitch))
+        # Pitch is accepted but not sent to the API, so it is not part of the key
+        voice, speed, _ = self._parse_options(options)
         
         # Create cache key
-        cache_key = self._create_cache_key(message, language, voice, speed, pitch)
+        cache_key = self._create_cache_key(message, language, voice, speed)
         
         # Check cache first
-        if cache_key in self._cache:
-            cache_entry = self._cache[cache_key]
-            if self._is_cache_valid(cache_entry):
+        cache_entry = self._cache.get(cache_key)
+        if cache_entry is not None and self._is_cache_valid(cache_entry):
+            cached_data = self._hot_audio.get(cache_key)
+            if cached_data is None:
+                try:
+                    cached_data = await self._hass.async_add_executor_job(
+                        (self._audio_dir / cache_key).read_bytes
+                    )
+                except OSError as err:
+                    _LOGGER.debug("Cached TTS audio unreadable, regenerating: %s", err)
+                    self._cache.pop(cache_key, None)
+                else:
+                    self._hot_audio.set(cache_key, cached_data)
+            if cached_data is not None:
                 _LOGGER.debug("Using cached TTS for message: %s", message[:50])
-                # Decode base64 data back to bytes
-                import base64
-                cached_data = base64.b64decode(cache_entry["data"])
+                self._record_hit(cache_key, cache_entry)
                 return cache_entry["content_type"], cached_data
         
         try:
@@ -193,8 +260,11 @@ class GeminiTTSEntity(TextToSpeechEntity):
             
             content_type = "wav"  # Return codec name for FFmpeg compatibility
             
-            # Cache the result
-            await self._cache_audio(cache_key, content_type, audio_data)
+            # Cache the result without holding up playback
+            self._hot_audio.set(cache_key, audio_data)
+            self._hass.async_create_task(
+                self._cache_audio(cache_key, content_type, audio_data)
+            )
             
             return content_type, audio_data
             
@@ -210,66 +280,146 @@ class GeminiTTSEntity(TextToSpeechEntity):
             audio_data = self._generate_placeholder_audio("Error occurred during speech synthesis")
             return "wav", audio_data
 
+    def _parse_options(self, options: Dict[str, Any] | None) -> tuple[str, float, float]:
+        """Return the voice, speed and pitch for a request."""
+        # Defaults are converted once at setup; most calls pass no options
+        if not options:
+            return self._default_voice, self._default_speed, self._default_pitch
+        
+        speed = options.get("speed")
+        pitch = options.get("pitch")
+        return (
+            options.get("voice", self._default_voice),
+            self._default_speed if speed is None else float(speed),
+            self._default_pitch if pitch is None else float(pitch),
+        )
+
     def _create_cache_key(
         self,
         message: str,
         language: str,
         voice: str,
         speed: float,
-        pitch: float,
     ) -> str:
         """Create a cache key for the given parameters."""
-        key_data = f"{message}|{language}|{voice}|{speed}|{pitch}|{self._model}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        # Only the short parameter tail is hashed per lookup; floats are packed
+        # so the key does not depend on their text form
+        hasher = hashlib.blake2b(_message_digest(message), digest_size=16)
+        hasher.update(struct.pack("<d", round(speed, 2)))
+        hasher.update(f"{language.lower()}|{voice}|{self._model}".encode())
+        return hasher.hexdigest()
 
     def _is_cache_valid(self, cache_entry: Dict[str, Any]) -> bool:
         """Check if cache entry is still valid."""
-        import time
         return time.time() - cache_entry.get("timestamp", 0) < CACHE_TTL
 
     async def _cache_audio(self, cache_key: str, content_type: str, audio_data: bytes) -> None:
         """Cache audio data."""
-        import time
-        import base64
-        
-        # Remove old entries if cache is full
-        if len(self._cache) >= MAX_CACHE_SIZE:
+        # Remove old entries if cache is full, or periodically drop expired ones
+        self._inserts_since_sweep += 1
+        if (
+            len(self._cache) >= MAX_CACHE_SIZE
+            or self._inserts_since_sweep >= TTS_CACHE_SWEEP_INSERTS
+        ):
             await self._cleanup_cache()
         
-        # Add to cache (encode bytes as base64 for JSON serialization)
+        # Write the audio as raw bytes; only its metadata goes into the store
+        try:
+            await self._hass.async_add_executor_job(self._write_audio, cache_key, audio_data)
+        except OSError as err:
+            _LOGGER.warning("Failed to cache TTS audio: %s", err)
+            return
+        
         self._cache[cache_key] = {
             "content_type": content_type,
-            "data": base64.b64encode(audio_data).decode('utf-8'),
             "timestamp": time.time(),
+            "size": len(audio_data),
         }
         
-        # Save to storage (async)
-        self._hass.async_create_task(self._save_cache())
+        # Coalesce index writes from bursts of new phrases
+        self._store.async_delay_save(lambda: self._cache, TTS_CACHE_SAVE_DELAY)
+
+    def _record_hit(self, cache_key: str, cache_entry: Dict[str, Any]) -> None:
+        """Count a cache hit, so frequently played phrases outlive one-offs."""
+        self._cache.move_to_end(cache_key)
+        hits = cache_entry.get("hits", 0) + 1
+        cache_entry["hits"] = hits
+        if hits >= TTS_CACHE_MAX_HITS:
+            # Halve every count so phrases that stopped being played age out
+            for entry in self._cache.values():
+                entry["hits"] = entry.get("hits", 0) // 2
+        
+        self._store.async_delay_save(lambda: self._cache, TTS_CACHE_SAVE_DELAY)
 
     async def _cleanup_cache(self) -> None:
         """Remove old cache entries."""
-        import time
         current_time = time.time()
+        removed = []
         
-        # Remove expired entries
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if current_time - entry.get("timestamp", 0) > CACHE_TTL
-        ]
+        # Remove expired entries, scanning the whole cache only every few
+        # inserts; in between, eviction below only touches the oldest entries
+        if self._inserts_since_sweep >= TTS_CACHE_SWEEP_INSERTS:
+            self._inserts_since_sweep = 0
+            removed = [
+                key for key, entry in self._cache.items()
+                if current_time - entry.get("timestamp", 0) > CACHE_TTL
+            ]
+            for key in removed:
+                del self._cache[key]
         
-        for key in expired_keys:
+        # If still full, make room by dropping the least used entry; min()
+        # keeps the first of equal counts, which is the least recently used
+        while len(self._cache) >= MAX_CACHE_SIZE:
+            key = min(self._cache, key=lambda k: self._cache[k].get("hits", 0))
             del self._cache[key]
+            removed.append(key)
         
-        # If still too many entries, remove oldest
-        if len(self._cache) >= MAX_CACHE_SIZE:
-            sorted_entries = sorted(
-                self._cache.items(),
-                key=lambda x: x[1].get("timestamp", 0)
-            )
-            
-            # Keep only the newest entries
-            keep_count = MAX_CACHE_SIZE // 2
-            self._cache = dict(sorted_entries[-keep_count:])
+        if removed:
+            for key in removed:
+                self._hot_audio.pop(key)
+            await self._hass.async_add_executor_job(self._remove_audio, removed)
+
+    def _write_audio(self, cache_key: str, audio_data: bytes) -> None:
+        """Write the audio file for a cache key."""
+        self._audio_dir.mkdir(parents=True, exist_ok=True)
+        (self._audio_dir / cache_key).write_bytes(audio_data)
+
+    def _read_audio(self, cache_keys: Iterable[str]) -> Dict[str, bytes]:
+        """Return the audio of the given cache keys that is still on disk."""
+        clips = {}
+        for cache_key in cache_keys:
+            try:
+                clips[cache_key] = (self._audio_dir / cache_key).read_bytes()
+            except OSError:
+                pass
+        return clips
+
+    def _remove_audio(self, cache_keys: Iterable[str]) -> None:
+        """Delete the audio files of evicted cache keys."""
+        for cache_key in cache_keys:
+            try:
+                os.remove(self._audio_dir / cache_key)
+            except FileNotFoundError:
+                pass
+
+    def _scan_audio_dir(self, cache_keys: set[str]) -> set[str]:
+        """Return the cache keys with audio on disk, deleting orphaned files."""
+        found = set()
+        try:
+            entries = list(os.scandir(self._audio_dir))
+        except FileNotFoundError:
+            return found
+        
+        for entry in entries:
+            if entry.name in cache_keys:
+                found.add(entry.name)
+            elif entry.name not in self._cache:
+                # Left behind by an index write that never happened
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+        return found
 
     async def _save_cache(self) -> None:
         """Save cache to storage."""
@@ -289,37 +439,11 @@ class GeminiTTSEntity(TextToSpeechEntity):
     
     def _generate_wav_silence(self, duration_ms: int) -> bytes:
         """Generate a WAV file with silence."""
-        import struct
-        
-        # WAV file parameters
-        sample_rate = 22050
-        channels = 1
-        bits_per_sample = 16
         duration_seconds = min(duration_ms / 1000.0, 3.0)  # Max 3 seconds
-        num_samples = int(sample_rate * duration_seconds)
-        
-        # WAV header
-        wav_header = struct.pack(
-            '<4sI4s4sIHHIIHH4sI',
-            b'RIFF',
-            36 + num_samples * channels * bits_per_sample // 8,
-            b'WAVE',
-            b'fmt ',
-            16,  # PCM
-            1,   # PCM
-            channels,
-            sample_rate,
-            sample_rate * channels * bits_per_sample // 8,
-            channels * bits_per_sample // 8,
-            bits_per_sample,
-            b'data',
-            num_samples * channels * bits_per_sample // 8
-        )
-        
-        # Generate silence (zeros)
-        audio_data = b'\x00' * (num_samples * channels * bits_per_sample // 8)
+        num_samples = int(_SILENCE_SAMPLE_RATE * duration_seconds)
         
-        return wav_header + audio_data
+        # Round up to whole blocks so a few sizes cover every message length
+        return _wav_silence(-(-num_samples // _SILENCE_BLOCK) * _SILENCE_BLOCK)
 
     async def async_will_remove_from_hass(self) -> None:
         """Clean up when entity is removed."""